@@ -0,0 +1,72 @@
+"""
+Micro-benchmark for model construction
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+Compares building :class:`tl3api.Map` objects from a decoded page against the
+previous implementation (two ``re.sub`` calls per key and a per-instance
+``__dict__``), reporting throughput and memory per object.
+
+Run with ``python benchmarks/bench_models.py``.
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tl3api import Map
+
+def sample_map(object_id: int) -> dict:
+    return {
+        "name": f"Map {object_id}", "desc": "A synthetic map", "gameModeGroup": 1 + object_id % 3,
+        "fileName": f"map{object_id}", "fileExt": "tl3", "author": object_id % 5000,
+        "created": 1600000000000 + object_id, "updated": 1600000000000 + object_id, "gameVersion": 34,
+        "votesUp": object_id % 311, "votesDown": object_id % 17, "highScore": object_id % 997,
+        "highScoreUser": object_id % 4000, "fullyUploaded": True, "mapVersion": 1, "targetScore": 100,
+        "favorites": object_id % 53, "deleted": False, "objectId": object_id, "authorName": f"user{object_id % 5000}",
+    }
+
+class LegacyMap:
+    """The model layout before ``__slots__`` and memoized key conversion."""
+
+    def __init__(self, client, _data):
+        self._client = client
+        if _data:
+            for attribute, value in _data.items():
+                setattr(self, self._convert(attribute), value)
+
+    def _convert(self, string):
+        s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", string)
+        return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
+
+def throughput(cls, page, repeat: int) -> float:
+    timer = timeit.Timer(lambda: [cls(None, item) for item in page])
+    best = min(timer.repeat(repeat=repeat, number=1))
+    return len(page) / best
+
+def memory_per_object(cls, page) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [cls(None, item) for item in page]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del objects
+    return allocated / len(page)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000, help="objects per page")
+    parser.add_argument("--repeat", type=int, default=20, help="timing repetitions, the best one is reported")
+    args = parser.parse_args()
+
+    page = [sample_map(i) for i in range(args.size)]
+    print(f"{'model':<12}{'objects/s':>14}{'bytes/object':>16}")
+    for label, cls in (("before", LegacyMap), ("after", Map)):
+        print(f"{label:<12}{throughput(cls, page, args.repeat):>14,.0f}{memory_per_object(cls, page):>16,.0f}")
+
+if __name__ == "__main__":
+    main()
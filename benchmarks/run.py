@@ -0,0 +1,213 @@
+"""
+Client benchmark suite
+~~~~~~~~~~~~~~~~~~~~~~
+
+Runs every :class:`tl3api.Client` method and a few large fan-out scenarios
+against the local stand-in backend (``benchmarks/server.py``, started in a
+separate process), and reports requests per second, p50 / p99 latency, CPU
+time spent decoding JSON and building objects, and peak memory.
+
+Run with ``python benchmarks/run.py``, see ``--help`` for the options.
+"""
+from typing import Callable, Awaitable, Any, Dict, List, Optional
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server
+import tl3api
+
+Scenario = Callable[[tl3api.Client, int], Awaitable[Any]]
+
+class TimedClient(tl3api.Client):
+    """A :class:`tl3api.Client` accumulating CPU time spent on decoding and object construction."""
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.decode_time = 0.0
+        self.build_time = 0.0
+
+    def _decode(self, body: bytes) -> Any:
+        start = time.process_time()
+        try:
+            return super()._decode(body)
+        finally:
+            self.decode_time += time.process_time() - start
+
+    def _timed_feed(self, parser, chunk, event):
+        # Streamed responses are parsed by the ArrayParser instead of _decode.
+        start = time.process_time()
+        try:
+            return super()._timed_feed(parser, chunk, event)
+        finally:
+            self.decode_time += time.process_time() - start
+
+    def _build(self, cls, payload):
+        start = time.process_time()
+        try:
+            return super()._build(cls, payload)
+        finally:
+            self.build_time += time.process_time() - start
+
+    def _build_many(self, cls, payload):
+        start = time.process_time()
+        try:
+            return super()._build_many(cls, payload)
+        finally:
+            self.build_time += time.process_time() - start
+
+async def _drain(iterator) -> int:
+    count = 0
+    async for _ in iterator:
+        count += 1
+    return count
+
+def scenarios(page_size: int) -> Dict[str, Scenario]:
+    """Return the benchmark scenarios by name. Each one receives the client and the iteration number."""
+    return {
+        "get_details_for_user": lambda c, i: c.get_details_for_user(1 + i % 20000),
+        "search_for_users": lambda c, i: c.search_for_users(f"player{i}", result=page_size),
+        "get_map_details": lambda c, i: c.get_map_details(1 + i % 100000),
+        "list_maps_by_user": lambda c, i: c.list_maps_by_user(1 + i % 20000, result=page_size),
+        "search_for_maps": lambda c, i: c.search_for_maps(f"road{i % 7}", game_mode=1 + i % 3, result=page_size, page=i % 10),
+        "list_new_maps": lambda c, i: c.list_new_maps(game_mode=1 + i % 3, result=page_size, page=i % 50),
+        "find_top_maps": lambda c, i: c.find_top_maps(game_mode=1 + i % 3, time="week", result=page_size, page=i % 10),
+        "list_comments_on_map": lambda c, i: c.list_comments_on_map(299 + i * 1000 % 99000, limit=page_size),
+        "list_high_scores_on_map": lambda c, i: c.list_high_scores_on_map(499 + i * 500 % 99000, count=page_size),
+        "stream_new_maps": lambda c, i: _drain(c.stream_new_maps(game_mode=1 + i % 3, result=page_size, page=i % 50)),
+        "stream_comments_on_map": lambda c, i: _drain(c.stream_comments_on_map(299 + i * 1000 % 99000, limit=page_size)),
+        "fanout_get_map_details_many": lambda c, i: c.get_map_details_many(range(1 + i * 1000, 1001 + i * 1000), concurrency=64),
+        "fanout_get_details_for_users": lambda c, i: c.get_details_for_users(range(1 + i * 500, 501 + i * 500), concurrency=64),
+        "fanout_iter_new_maps": lambda c, i: _drain(c.iter_new_maps(game_mode=1 + i % 3, result=page_size, max_items=page_size * 20)),
+    }
+
+async def run_scenario(
+    name: str,
+    scenario: Scenario,
+    base_url: str,
+    requests: int,
+    concurrency: int,
+    measure_memory: bool
+) -> Dict[str, Any]:
+    """Run a scenario ``requests`` times with ``concurrency`` calls in flight and return its measurements."""
+    fanout = name.startswith("fanout_")
+    calls = max(1, requests // 100) if fanout else requests
+    workers = 1 if fanout else concurrency
+
+    client = TimedClient(base_url=base_url, pool=tl3api.PoolOptions(limit=max(100, concurrency)))
+    # One warm-up call opens connections and fills the key conversion cache.
+    await scenario(client, calls)
+    client.decode_time = client.build_time = 0.0
+
+    latencies: List[float] = []
+    counter = iter(range(calls))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            await scenario(client, i)
+            latencies.append(time.perf_counter() - start)
+
+    if measure_memory:
+        tracemalloc.start()
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    peak = tracemalloc.get_traced_memory()[1] if measure_memory else None
+    if measure_memory:
+        tracemalloc.stop()
+    await client.close()
+
+    latencies.sort()
+    return {
+        "scenario": name,
+        "calls": calls,
+        "calls_per_s": calls / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000,
+        "cpu_s": cpu,
+        "decode_cpu_s": client.decode_time,
+        "build_cpu_s": client.build_time,
+        "peak_mib": peak / 2 ** 20 if peak is not None else None,
+    }
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+async def _wait_for(host: str, port: int, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+async def main_async(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    port = _free_port()
+    options = {"latency": args.latency, "jitter": args.jitter, "error_rate": args.error_rate}
+    process = multiprocessing.get_context("spawn").Process(target=server.serve, args=("127.0.0.1", port, options), daemon=True)
+    process.start()
+    try:
+        await _wait_for("127.0.0.1", port)
+        base_url = f"http://127.0.0.1:{port}{server.ROOT}"
+
+        results = []
+        for name, scenario in scenarios(args.page_size).items():
+            if args.only and not any(part in name for part in args.only):
+                continue
+            result = await run_scenario(name, scenario, base_url, args.requests, args.concurrency, args.memory)
+            results.append(result)
+            if not args.json:
+                _print_row(result)
+        return results
+    finally:
+        process.terminate()
+        process.join()
+
+def _print_row(result: Dict[str, Any]):
+    peak = f"{result['peak_mib']:.1f}" if result["peak_mib"] is not None else "-"
+    print(
+        f"{result['scenario']:<30}{result['calls_per_s']:>10.1f}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+        f"{result['decode_cpu_s']:>10.3f}{result['build_cpu_s']:>10.3f}{peak:>10}"
+    )
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark tl3api.Client against a local stand-in backend.")
+    parser.add_argument("--requests", type=int, default=500, help="calls per scenario, fan-out scenarios run a hundredth of it")
+    parser.add_argument("--concurrency", type=int, default=16, help="calls in flight per scenario")
+    parser.add_argument("--page-size", type=int, default=100, help="result / limit / count for list endpoints")
+    parser.add_argument("--latency", type=float, default=0.0, help="server latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra server latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of failing server responses")
+    parser.add_argument("--memory", action="store_true", help="trace peak memory, slows everything down")
+    parser.add_argument("--only", nargs="*", help="run only scenarios whose name contains one of these")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+
+    if not args.json:
+        print(f"{'scenario':<30}{'calls/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'decode s':>10}{'build s':>10}{'peak MiB':>10}")
+    results = asyncio.run(main_async(args))
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
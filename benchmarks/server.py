@@ -0,0 +1,274 @@
+"""
+Local stand-in for the TL3 backend
+~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~~
+
+An aiohttp application serving every endpoint :class:`tl3api.Client` uses,
+with deterministic synthetic users, maps, comments and high scores. Latency,
+jitter and an error rate can be configured to exercise the client's retries.
+
+Run standalone with ``python benchmarks/server.py --port 8080`` and point a
+client at it with ``Client(base_url="http://127.0.0.1:8080/TL3BackEnd/rest")``.
+"""
+from typing import Optional, List, Dict, Any
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+
+from aiohttp import web
+
+ROOT = "/TL3BackEnd/rest"
+
+WORDS = (
+    "highway", "junction", "roundabout", "bridge", "tunnel", "city", "village", "rush", "hour", "traffic",
+    "lights", "merge", "crossing", "harbor", "airport", "station", "loop", "spiral", "downtown", "express",
+)
+
+class StandInBackend:
+    """Synthetic data and request handlers for the stand-in backend."""
+
+    def __init__(
+        self,
+        maps: int = 100000,
+        users: int = 20000,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0
+    ):
+        """Initialize a :class:`.StandInBackend` instance.
+
+        :param maps: Amount of maps in the catalog, IDs run from 1 to ``maps``.
+        :param users: Amount of users, IDs run from 1 to ``users``.
+        :param latency: Seconds added to every response.
+        :param jitter: Up to this many seconds are added on top of ``latency`` at random.
+        :param error_rate: Share of requests answered with a 500 or a 503 with Retry-After.
+        :param seed: Seed for the synthetic data.
+        """
+        self.maps = maps
+        self.users = users
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.seed = seed
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._rankings: Dict[Any, List[int]] = {}
+
+    def user(self, user_id: int) -> Dict[str, Any]:
+        rng = random.Random(self.seed * 1000003 + user_id)
+        return {
+            "objectId": user_id,
+            "gameVersion": rng.randint(20, 34),
+            "lastLogin": 1600000000000 + rng.randint(0, 10 ** 11),
+            "maps": rng.randint(0, 200),
+            "name": f"player{user_id}",
+            "followers": rng.randint(0, 5000),
+        }
+
+    def map(self, map_id: int) -> Dict[str, Any]:
+        rng = random.Random(self.seed * 7919 + map_id)
+        author = rng.randint(1, self.users)
+        created = 1500000000000 + map_id * 600000
+        return {
+            "name": " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3))).title(),
+            "desc": " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 40))),
+            "gameModeGroup": 1 + map_id % 3,
+            "fileName": hashlib.md5(str(map_id).encode()).hexdigest(),
+            "fileExt": "tl3",
+            "author": author,
+            "created": created,
+            "updated": created + rng.randint(0, 10 ** 9),
+            "gameVersion": rng.randint(20, 34),
+            "votesUp": int(rng.paretovariate(1.2)) - 1,
+            "votesDown": rng.randint(0, 20),
+            "highScore": rng.randint(0, 5000),
+            "highScoreUser": rng.randint(1, self.users),
+            "fullyUploaded": True,
+            "mapVersion": rng.randint(1, 5),
+            "targetScore": rng.randint(50, 500),
+            "favorites": rng.randint(0, 300),
+            "deleted": False,
+            "objectId": map_id,
+            "authorName": f"player{author}",
+        }
+
+    def comment(self, map_id: int, comment_id: int) -> Dict[str, Any]:
+        rng = random.Random(self.seed * 104729 + comment_id)
+        user = rng.randint(1, self.users)
+        reply = rng.randint(1, self.users) if rng.random() < 0.3 else 0
+        return {
+            "user": user,
+            "map": map_id,
+            "comment": " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 25))),
+            "flag": 0,
+            "datePosted": 1600000000000 + comment_id * 1000,
+            "rtl": False,
+            "replyToUserId": reply,
+            "objectId": comment_id,
+            "username": f"player{user}",
+            "replyUsername": f"player{reply}" if reply else "",
+        }
+
+    def high_score(self, map_id: int, rank: int) -> Dict[str, Any]:
+        rng = random.Random(self.seed * 15485863 + map_id * 1000 + rank)
+        user = rng.randint(1, self.users)
+        return {
+            "userId": user,
+            "mapId": map_id,
+            "score": max(0, 5000 - rank * 7 - rng.randint(0, 6)),
+            "mapVersion": rng.randint(1, 5),
+            "dateMade": 1600000000000 + rng.randint(0, 10 ** 11),
+            "objectId": map_id * 1000 + rank,
+            "username": f"player{user}",
+        }
+
+    def _page(self, ids: range, request: web.Request, default: int = 50) -> range:
+        result = int(request.query.get("result", default))
+        page = int(request.query.get("page", 0))
+        return ids[page * result:(page + 1) * result]
+
+    def _mode_ids(self, mode: int, limit: Optional[int] = None) -> range:
+        # gameModeGroup is 1 + map_id % 3
+        first = 3 if mode == 1 else mode - 1
+        return range(first, min(self.maps, limit or self.maps) + 1, 3)
+
+    @web.middleware
+    async def middleware(self, request: web.Request, handler) -> web.StreamResponse:
+        self.requests += 1
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self._random.random() < self.error_rate:
+            if self._random.random() < 0.5:
+                return web.Response(status=503, headers={"Retry-After": "0"})
+            return web.Response(status=500)
+        return await handler(request)
+
+    async def user_info(self, request: web.Request) -> web.Response:
+        user_id = int(request.match_info["user_id"])
+        if not 1 <= user_id <= self.users:
+            return web.Response(status=404)
+        return _json(self.user(user_id))
+
+    async def user_search(self, request: web.Request) -> web.Response:
+        query = request.query.get("query", "")
+        digits = sum(map(ord, query)) % self.users
+        ids = range(digits + 1, self.users + 1)
+        return _json([self.user(user_id) for user_id in self._page(ids, request)])
+
+    async def map_meta(self, request: web.Request) -> web.Response:
+        map_id = int(request.match_info["map_id"])
+        if not 1 <= map_id <= self.maps:
+            return web.Response(status=404)
+        return _json(self.map(map_id))
+
+    async def map_thumb(self, request: web.Request) -> web.Response:
+        map_id = int(request.match_info["map_id"])
+        if not 1 <= map_id <= self.maps:
+            return web.Response(status=404)
+        # A handful of distinct images, so content deduplication has something to do.
+        body = hashlib.sha256(str(map_id % 16).encode()).digest() * 512
+        etag = f'"{map_id % 16}"'
+        start = request.http_range.start
+        # A Range request whose If-Range doesn't match gets the whole image.
+        if start and request.headers.get("If-Range", etag) == etag:
+            if start >= len(body):
+                return web.Response(status=416, headers={"Content-Range": f"bytes */{len(body)}"})
+            headers = {"Content-Range": f"bytes {start}-{len(body) - 1}/{len(body)}", "ETag": etag}
+            return web.Response(status=206, body=body[start:], content_type="image/png", headers=headers)
+        return web.Response(body=body, content_type="image/png", headers={"ETag": etag})
+
+    async def maps_by_user(self, request: web.Request) -> web.Response:
+        user_id = int(request.match_info["user_id"])
+        ids = range(user_id, self.maps + 1, self.users)
+        return _json([self.map(map_id) for map_id in self._page(ids, request)])
+
+    async def new_maps(self, request: web.Request) -> web.Response:
+        mode = int(request.match_info["mode"])
+        ids = self._mode_ids(mode)[::-1]
+        return _json([self.map(map_id) for map_id in self._page(ids, request)])
+
+    async def top_maps(self, request: web.Request) -> web.Response:
+        mode = int(request.match_info["mode"])
+        span = {"day": 200, "week": 1000, "month": 4000}.get(request.match_info["time"], self.maps)
+        offset = int(request.query.get("offset", 0))
+        if offset > 0:
+            return _json([])
+        key = (mode, span, offset)
+        ranked = self._rankings.get(key)
+        if ranked is None:
+            rng = random.Random(hash(key) + self.seed)
+            ranked = list(self._mode_ids(mode, span * 3))
+            rng.shuffle(ranked)
+            self._rankings[key] = ranked
+        return _json([self.map(map_id) for map_id in self._page(ranked, request)])
+
+    async def map_search(self, request: web.Request) -> web.Response:
+        mode = int(request.match_info["mode"])
+        query = request.query.get("query", "").lower()
+        page = self._page(self._mode_ids(mode)[::1 + len(query) % 7], request)
+        return _json([self.map(map_id) for map_id in page])
+
+    async def comments(self, request: web.Request) -> web.Response:
+        map_id = int(request.match_info["map_id"])
+        limit = int(request.query.get("limit", 50))
+        count = map_id % 300
+        newest = map_id * 1000 + count
+        before = int(request.query.get("before", newest + 1))
+        ids = range(min(before - 1, newest), max(map_id * 1000, before - 1 - limit), -1)
+        return _json([self.comment(map_id, comment_id) for comment_id in ids])
+
+    async def high_scores(self, request: web.Request) -> web.Response:
+        map_id = int(request.match_info["map_id"])
+        count = min(int(request.query.get("count", 10)), 1 + map_id % 500)
+        return _json([self.high_score(map_id, rank) for rank in range(count)])
+
+    def make_app(self) -> web.Application:
+        """Return the aiohttp application serving the backend under ``/TL3BackEnd/rest``."""
+        app = web.Application(middlewares=[self.middleware])
+        app.router.add_get(f"{ROOT}/user2/public/info/{{user_id}}", self.user_info)
+        app.router.add_get(f"{ROOT}/user2/public/search", self.user_search)
+        app.router.add_get(f"{ROOT}/map/public/user/{{user_id}}", self.maps_by_user)
+        app.router.add_get(f"{ROOT}/map/public/new/{{mode}}", self.new_maps)
+        app.router.add_get(f"{ROOT}/map/public/top/{{mode}}/search", self.map_search)
+        app.router.add_get(f"{ROOT}/map/public/top/{{mode}}/{{time}}", self.top_maps)
+        app.router.add_get(f"{ROOT}/map/public/{{map_id}}/meta", self.map_meta)
+        app.router.add_get(f"{ROOT}/map/public/{{map_id}}/thumb", self.map_thumb)
+        app.router.add_get(f"{ROOT}/comment/public/{{map_id}}", self.comments)
+        app.router.add_get(f"{ROOT}/highscore/public/{{map_id}}", self.high_scores)
+        return app
+
+def _json(payload: Any) -> web.Response:
+    return web.Response(body=json.dumps(payload, separators=(",", ":")).encode(), content_type="application/json")
+
+def serve(
+    host: str,
+    port: int,
+    options: Optional[Dict[str, Any]] = None
+):
+    """Serve a :class:`.StandInBackend` until interrupted, used as a subprocess target."""
+    backend = StandInBackend(**(options or {}))
+    web.run_app(backend.make_app(), host=host, port=port, print=None, access_log=None)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for the TL3 backend.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--maps", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=20000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="random extra seconds on top of the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests failing with 500 / 503")
+    args = parser.parse_args(argv)
+
+    print(f"Serving on http://{args.host}:{args.port}{ROOT}")
+    serve(args.host, args.port, {
+        "maps": args.maps, "users": args.users, "latency": args.latency,
+        "jitter": args.jitter, "error_rate": args.error_rate,
+    })
+
+if __name__ == "__main__":
+    main()
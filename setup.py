@@ -20,5 +20,11 @@ setup(
     long_description=open("README.md").read(),
     long_description_content_type="text/markdown",
     keywords="api, ic, tl3, wrapper, async",
-    requires=["aiohttp"]
+    requires=["aiohttp"],
+    extras_require={
+        "msgpack": ["msgpack"],
+        "numpy": ["numpy"],
+        "orjson": ["orjson"],
+        "parquet": ["pyarrow"]
+    }
 )
\ No newline at end of file
@@ -7,12 +7,29 @@ A basic async wrapper for the IC API
 :copyright: (c) 2022-present Feeeeddmmmeee
 :license: MIT, see LICENSE for more details
 """
+from tl3api.cache import CachePolicy, ResponseCache
 from tl3api.comment import Comment
+from tl3api.crawler import Crawler, CrawlResult, ShardProgress
+from tl3api.errors import HTTPException, NotFound, RateLimited, ServerError, TL3Exception
+from tl3api.export import export, schema_for
 from tl3api.high_score import HighScore
+from tl3api.identity import IdentityMap
+from tl3api.instrumentation import MetricsObserver, Observer, RequestEvent
+from tl3api.leaderboard import Leaderboard
 from tl3api.map import Map 
+from tl3api.ratelimit import AdaptiveConcurrency, RetryPolicy, SharedTokenBucket, TokenBucket
+from tl3api.search import SearchHit, SearchIndex
+from tl3api.serialization import from_bytes, from_bytes_many, to_bytes, to_bytes_many
+from tl3api.session import PoolOptions
+from tl3api.store import PayloadStore, SQLiteStore
+from tl3api.streaming import ArrayParser
+from tl3api.sync import CatalogSync, MemorySink, Sink
+from tl3api.table import ColumnTable, HighScoreTable, MapTable
+from tl3api.thumbnails import ThumbnailDownloader
 from tl3api.user import User
-from tl3api.wrapper import Client
+from tl3api.watch import NewEntry, NewHighScore, RankMoved, VotesChanged, Watcher, WatchEvent
+from tl3api.wrapper import Client, RawClient
 
 __version__ = "1.2.0"
 
-__all__ = ["Comment", "HighScore", "Map", "User", "Client"]
\ No newline at end of file
+__all__ = ["AdaptiveConcurrency", "ArrayParser", "CachePolicy", "CatalogSync", "ColumnTable", "Comment", "Crawler", "CrawlResult", "HighScore", "HighScoreTable", "HTTPException", "IdentityMap", "Leaderboard", "Map", "MapTable", "MemorySink", "MetricsObserver", "NewEntry", "NewHighScore", "NotFound", "Observer", "PayloadStore", "PoolOptions", "RankMoved", "RateLimited", "RequestEvent", "ResponseCache", "RetryPolicy", "SearchHit", "SearchIndex", "ServerError", "ShardProgress", "SharedTokenBucket", "Sink", "SQLiteStore", "ThumbnailDownloader", "TL3Exception", "TokenBucket", "User", "VotesChanged", "Watcher", "WatchEvent", "Client", "RawClient", "export", "from_bytes", "from_bytes_many", "schema_for", "to_bytes", "to_bytes_many"]
\ No newline at end of file
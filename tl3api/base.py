@@ -1,14 +1,39 @@
-from typing import TYPE_CHECKING, Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any, FrozenSet
 
+import copy
+import functools
 import re
 
 if TYPE_CHECKING:
     from wrapper import Client
 
+@functools.lru_cache(maxsize=4096)
+def convert_key(string: str) -> str:
+    """Convert a camelCase API key to its snake_case attribute name.
+
+    The result is memoized, so the regular expressions only run once per distinct key.
+    """
+    s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", string)
+    return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
+
 class ICObjectBase:
-    """Superclass for all Intersection Controller classes."""
+    """Superclass for all Intersection Controller classes.
+
+    Known attributes live in ``__slots__``, fields the API returns that a class doesn't declare are kept in :attr:`extra`.
+    """
+    __slots__ = ("_client", "_extra", "object_id", "__weakref__")
+
     _client: "Client"
     object_id: int
+    _fields: FrozenSet[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        fields = set()
+        for klass in cls.__mro__:
+            slots = klass.__dict__.get("__slots__", ())
+            fields.update(slot for slot in ((slots,) if isinstance(slots, str) else slots) if not slot.startswith("_"))
+        cls._fields = frozenset(fields)
 
     def __init__(
         self, 
@@ -21,9 +46,59 @@ class ICObjectBase:
 
         """
         self._client = client
+        self._extra = None
         if _data:
+            fields = self._fields
             for attribute, value in _data.items():
-                setattr(self, self._convert(attribute), value)
+                name = convert_key(attribute)
+                if name in fields:
+                    setattr(self, name, value)
+                else:
+                    if self._extra is None:
+                        self._extra = {}
+                    self._extra[name] = value
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # The client holds a live session, objects are pickled without it and re-attached later.
+        state = {name: getattr(self, name) for name in self._fields if hasattr(self, name)}
+        state["_extra"] = self._extra
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]):
+        self._client = None
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def __copy__(self) -> "ICObjectBase":
+        # Unlike pickling, copying keeps the client.
+        obj = type(self).__new__(type(self))
+        obj.__setstate__(self.__getstate__())
+        obj._client = self._client
+        return obj
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "ICObjectBase":
+        obj = type(self).__new__(type(self))
+        memo[id(self)] = obj
+        obj.__setstate__(copy.deepcopy(self.__getstate__(), memo))
+        obj._client = self._client
+        return obj
+
+    def attach(self, client: "Client") -> "ICObjectBase":
+        """Attach a decoded or unpickled object to a :class:`.Client` and return it.
+
+        Objects restored by :func:`.from_bytes` or :mod:`pickle` have no client until they are attached.
+        """
+        self._client = client
+        return self
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            extra = object.__getattribute__(self, "_extra")
+        except AttributeError:
+            extra = None
+        if extra and name in extra:
+            return extra[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
 
     def __eq__(self, other: "ICObjectBase") -> bool:
         return self.object_id == other.object_id
@@ -31,6 +106,10 @@ class ICObjectBase:
     def __ne__(self, other: "ICObjectBase") -> bool:
         return not self == other
 
+    @property
+    def extra(self) -> Dict[str, Any]:
+        """Fields returned by the API that this class doesn't declare, by snake_case name."""
+        return dict(self._extra) if self._extra else {}
+
     def _convert(self, string: str) -> str:
-        s1 = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", string)
-        return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
\ No newline at end of file
+        return convert_key(string)
\ No newline at end of file
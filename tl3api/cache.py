@@ -0,0 +1,186 @@
+from typing import Optional, Dict, Any, Tuple, Literal
+from collections import OrderedDict
+
+import time
+
+CacheMode = Literal["use", "bypass", "refresh"]
+"""``"use"`` reads and writes the cache, ``"bypass"`` skips it and ``"refresh"`` ignores cached responses but stores the new one."""
+
+class CachePolicy:
+    """Freshness rules for the responses of a single endpoint.
+
+    =================================== ================================================
+    Attribute                           Description
+    =================================== ================================================
+    ttl                                 Seconds a response is served as fresh.
+    stale_ttl                           Seconds after ``ttl`` during which a stale
+                                        response is still served while it is refreshed
+                                        in the background.
+    """
+    __slots__ = ("ttl", "stale_ttl")
+
+    ttl: float
+    """Seconds a response is served as fresh."""
+    stale_ttl: float
+    """Seconds after ``ttl`` during which a stale response is still served while it is refreshed in the background."""
+
+    def __init__(
+        self,
+        ttl: float,
+        stale_ttl: float = 0.0
+    ):
+        """Initialize a :class:`.CachePolicy` instance.
+
+        :param ttl: Seconds a response is served as fresh.
+        :param stale_ttl: Seconds after ``ttl`` during which a stale response may still be served.
+        """
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+    def __repr__(self) -> str:
+        return f"CachePolicy(ttl={self.ttl}, stale_ttl={self.stale_ttl})"
+
+DEFAULT_POLICIES: Dict[str, CachePolicy] = {
+    "user": CachePolicy(ttl=3600, stale_ttl=3600),
+    "user_search": CachePolicy(ttl=600, stale_ttl=600),
+    "map": CachePolicy(ttl=600, stale_ttl=600),
+    "user_maps": CachePolicy(ttl=600, stale_ttl=600),
+    "map_search": CachePolicy(ttl=300, stale_ttl=300),
+    "new_maps": CachePolicy(ttl=60, stale_ttl=60),
+    "top_maps": CachePolicy(ttl=60, stale_ttl=60),
+    "comments": CachePolicy(ttl=120, stale_ttl=120),
+    "high_scores": CachePolicy(ttl=120, stale_ttl=120),
+}
+"""The :class:`.CachePolicy` used for each endpoint unless overridden."""
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+class ResponseCache:
+    """An in-memory LRU cache for decoded API responses.
+
+    Entries are keyed on the full request URL and expire according to the :class:`.CachePolicy` of the endpoint they came from.
+    The cache is opt-in: pass an instance to :class:`.Client` to enable it.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024,
+        policies: Optional[Dict[str, CachePolicy]] = None,
+        default_policy: Optional[CachePolicy] = None
+    ):
+        """Initialize a :class:`.ResponseCache` instance.
+
+        :param maxsize: Maximum amount of responses to keep, least recently used ones are evicted first.
+        :param policies: Per-endpoint :class:`.CachePolicy` overrides, merged over :data:`.DEFAULT_POLICIES`.
+        :param default_policy: :class:`.CachePolicy` for endpoints without their own policy, a 300 second TTL if omitted.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.maxsize = maxsize
+        self.policies = dict(DEFAULT_POLICIES)
+        if policies:
+            self.policies.update(policies)
+        self.default_policy = default_policy if default_policy is not None else CachePolicy(ttl=300)
+
+        self._entries: "OrderedDict[str, Tuple[str, Any, float]]" = OrderedDict()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def policy_for(self, endpoint: str) -> CachePolicy:
+        """Return the :class:`.CachePolicy` of an endpoint."""
+        return self.policies.get(endpoint, self.default_policy)
+
+    def lookup(self, key: str) -> Tuple[str, Any]:
+        """Look a response up.
+
+        :param key: The request URL.
+        :return: A ``(state, value)`` tuple where state is ``"fresh"``, ``"stale"`` or ``"miss"``.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return MISS, None
+
+        endpoint, value, stored_at = entry
+        policy = self.policy_for(endpoint)
+        age = time.monotonic() - stored_at
+
+        if age <= policy.ttl:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return FRESH, value
+
+        if age <= policy.ttl + policy.stale_ttl:
+            self._entries.move_to_end(key)
+            self.stale_hits += 1
+            return STALE, value
+
+        del self._entries[key]
+        self.misses += 1
+        return MISS, None
+
+    def store(
+        self,
+        endpoint: str,
+        key: str,
+        value: Any
+    ):
+        """Store a response, evicting the least recently used ones if the cache is full.
+
+        :param endpoint: Name of the endpoint the response came from.
+        :param key: The request URL.
+        :param value: The decoded response.
+        """
+        self._entries[key] = (endpoint, value, time.monotonic())
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(
+        self,
+        key: Optional[str] = None,
+        endpoint: Optional[str] = None
+    ) -> int:
+        """Drop cached responses.
+
+        Without arguments the whole cache is cleared.
+
+        :param key: Drop only the response for this URL.
+        :param endpoint: Drop only responses that came from this endpoint.
+        :return: Amount of dropped responses.
+        """
+        if key is not None:
+            return 1 if self._entries.pop(key, None) is not None else 0
+
+        if endpoint is None:
+            dropped = len(self._entries)
+            self._entries.clear()
+            return dropped
+
+        keys = [k for k, entry in self._entries.items() if entry[0] == endpoint]
+        for k in keys:
+            del self._entries[k]
+        return len(keys)
+
+    def stats(self) -> Dict[str, int]:
+        """Return the cache's hit / miss counters."""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
@@ -22,6 +22,11 @@ class Comment(ICObjectBase):
     username                            Name of the :class:`.Comment` author.
     reply_username                      Name of the :class:`.User` who the :class:`.Comment` author replied to.
     """
+    __slots__ = (
+        "user", "map", "comment", "flag", "date_posted", "rtl", "reply_to_user_id", "username", 
+        "reply_username"
+    )
+
     user: int
     """ID of the :class:`.Comment` author."""
     map: int
@@ -46,15 +51,15 @@ class Comment(ICObjectBase):
 
     async def get_author(self) -> "User":
         """Return the :class:`.Comment`'s author."""
-        return await self._client.get_details_for_user(user_id=self.user)
+        return await self._client.resolve_user(user_id=self.user)
 
     async def get_reply_user(self) -> Optional["User"]:
-        """Return the :class:`.User`'s who the author replied to."""
-        try:
-            return await self._client.get_details_for_user(user_id=self.reply_to_user_id)
-        except:
+        """Return the :class:`.User`'s who the author replied to, ``None`` if the :class:`.Comment` isn't a reply."""
+        reply_to_user_id = getattr(self, "reply_to_user_id", None)
+        if not reply_to_user_id:
             return None
+        return await self._client.resolve_user(user_id=reply_to_user_id)
 
     async def get_map(self) -> "Map":
         """Return the :class:`.Map` on which the :class:`.Comment` was posted."""
-        return await self._client.get_map_details(map_id=self.map)
\ No newline at end of file
+        return await self._client.resolve_map(map_id=self.map)
\ No newline at end of file
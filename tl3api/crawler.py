@@ -0,0 +1,251 @@
+from typing import Optional, Dict, List, Tuple, Any, Iterable, AsyncIterator, Sequence, Literal
+
+import asyncio
+import functools
+import multiprocessing
+import multiprocessing.context
+import os
+import queue
+
+from tl3api.errors import NotFound
+from tl3api.ratelimit import SharedTokenBucket
+from tl3api.wrapper import RawClient
+
+Job = Literal["user", "user_maps"]
+
+class CrawlResult:
+    """One crawled object, as returned by :meth:`.Crawler.crawl`.
+
+    =================================== ================================================
+    Attribute                           Description
+    =================================== ================================================
+    endpoint                            ``"user"`` or ``"user_maps"``.
+    object_id                           The crawled user ID.
+    payload                             The decoded JSON, ``None`` for missing users.
+    error                               Description of the error that remained after
+                                        retrying, ``None`` on success.
+    shard                               Index of the shard the ID belongs to.
+    """
+    __slots__ = ("endpoint", "object_id", "payload", "error", "shard")
+
+    def __init__(
+        self,
+        endpoint: Job,
+        object_id: int,
+        payload: Any,
+        error: Optional[str],
+        shard: int
+    ):
+        self.endpoint = endpoint
+        self.object_id = object_id
+        self.payload = payload
+        self.error = error
+        self.shard = shard
+
+    def __repr__(self) -> str:
+        return f"<CrawlResult endpoint={self.endpoint!r} object_id={self.object_id} error={self.error!r}>"
+
+class ShardProgress:
+    """Progress of one shard of a :class:`.Crawler`, counted in results."""
+    __slots__ = ("index", "total", "done", "errors", "finished")
+
+    def __init__(
+        self,
+        index: int,
+        total: int
+    ):
+        self.index = index
+        self.total = total
+        self.done = 0
+        self.errors = 0
+        self.finished = False
+
+    def __repr__(self) -> str:
+        return f"<ShardProgress index={self.index} done={self.done}/{self.total} errors={self.errors}>"
+
+class Crawler:
+    """Crawls large user ID ranges with a pool of processes.
+
+    The IDs are split into shards that the processes take from a shared work queue.
+    Every process runs its own :class:`.RawClient`, so JSON decoding is spread over the cores, while a :class:`.SharedTokenBucket` keeps all of them within one request budget.
+    Results come back in batches through a bounded queue, a slow consumer pauses the processes instead of piling up memory.
+    """
+
+    def __init__(
+        self,
+        processes: Optional[int] = None,
+        rate: float = 10.0,
+        burst: Optional[float] = None,
+        concurrency: int = 16,
+        shard_size: int = 1000,
+        batch_size: int = 100,
+        queue_size: int = 64,
+        maps_per_user: int = 50,
+        max_version: int = 999,
+        client_options: Optional[Dict[str, Any]] = None,
+        context: Optional[multiprocessing.context.BaseContext] = None
+    ):
+        """Initialize a :class:`.Crawler` instance.
+
+        :param processes: Amount of worker processes, defaults to the amount of CPUs.
+        :param rate: Requests per second of all processes together.
+        :param burst: Burst size of the shared budget, defaults to ``rate``.
+        :param concurrency: Requests in flight per process.
+        :param shard_size: IDs per shard.
+        :param batch_size: Results sent back per queue item.
+        :param queue_size: Result batches that can wait in the queue.
+        :param maps_per_user: ``result`` passed to :meth:`.Client.list_maps_by_user`.
+        :param max_version: ``max_version`` passed to :meth:`.Client.list_maps_by_user`.
+        :param client_options: Keyword arguments for every process' :class:`.RawClient`, e.g. ``base_url`` or ``pool``. They must be picklable.
+        :param context: The multiprocessing context, defaults to ``spawn``.
+        """
+        if concurrency < 1 or shard_size < 1 or batch_size < 1 or queue_size < 1:
+            raise ValueError("concurrency, shard_size, batch_size and queue_size must be at least 1")
+
+        self.processes = processes or os.cpu_count() or 1
+        self.concurrency = concurrency
+        self.shard_size = shard_size
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self.maps_per_user = maps_per_user
+        self.max_version = max_version
+        self.client_options = dict(client_options or {})
+        self._context = context or multiprocessing.get_context("spawn")
+        self.rate_limiter = SharedTokenBucket(rate, burst, self._context)
+        self.progress: Dict[int, ShardProgress] = {}
+
+    async def crawl(
+        self,
+        user_ids: Iterable[int],
+        endpoints: Sequence[Job] = ("user",)
+    ) -> AsyncIterator[CrawlResult]:
+        """Fetch every endpoint for every user ID and yield the results as they arrive, in no particular order.
+
+        :attr:`progress` is reset and then tracks every shard while iterating.
+
+        :param user_ids: The IDs to crawl, a :class:`range` is sharded without being materialized.
+        :param endpoints: ``"user"`` for :meth:`.Client.get_details_for_user`, ``"user_maps"`` for :meth:`.Client.list_maps_by_user`.
+        """
+        for endpoint in endpoints:
+            if endpoint not in ("user", "user_maps"):
+                raise ValueError(f"unknown endpoint {endpoint!r}")
+
+        ids = user_ids if isinstance(user_ids, range) else list(user_ids)
+        shards = [ids[start:start + self.shard_size] for start in range(0, len(ids), self.shard_size)]
+        self.progress = {index: ShardProgress(index, len(shard) * len(endpoints)) for index, shard in enumerate(shards)}
+        if not shards:
+            return
+
+        tasks = self._context.Queue()
+        results = self._context.Queue(self.queue_size)
+        for task in enumerate(shards):
+            tasks.put(task)
+        workers = min(self.processes, len(shards))
+        for _ in range(workers):
+            tasks.put(None)
+
+        options = {
+            "endpoints": tuple(endpoints), "concurrency": self.concurrency, "batch_size": self.batch_size,
+            "maps_per_user": self.maps_per_user, "max_version": self.max_version, "client_options": self.client_options,
+        }
+        processes = [
+            self._context.Process(target=_run_worker, args=(tasks, results, self.rate_limiter, options), daemon=True)
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        loop = asyncio.get_running_loop()
+        pending = len(shards)
+        try:
+            while pending:
+                try:
+                    kind, index, value = await loop.run_in_executor(None, functools.partial(results.get, timeout=0.5))
+                except queue.Empty:
+                    if not any(process.is_alive() for process in processes):
+                        raise RuntimeError("the crawler processes exited before finishing every shard")
+                    continue
+
+                progress = self.progress[index]
+                if kind == "results":
+                    for result in value:
+                        progress.done += 1
+                        if result.error is not None:
+                            progress.errors += 1
+                        yield result
+                elif kind == "finished":
+                    progress.finished = True
+                    pending -= 1
+                else:
+                    raise RuntimeError(f"shard {index} failed: {value}")
+        finally:
+            for process in processes:
+                if pending:
+                    process.terminate()
+                process.join()
+            tasks.close()
+            results.close()
+
+def _run_worker(
+    tasks: "multiprocessing.Queue[Optional[Tuple[int, Sequence[int]]]]",
+    results: "multiprocessing.Queue[Tuple[str, int, Any]]",
+    rate_limiter: SharedTokenBucket,
+    options: Dict[str, Any]
+):
+    asyncio.run(_worker(tasks, results, rate_limiter, options))
+
+async def _worker(
+    tasks: "multiprocessing.Queue[Optional[Tuple[int, Sequence[int]]]]",
+    results: "multiprocessing.Queue[Tuple[str, int, Any]]",
+    rate_limiter: SharedTokenBucket,
+    options: Dict[str, Any]
+):
+    loop = asyncio.get_running_loop()
+    async with RawClient(rate_limiter=rate_limiter, **options["client_options"]) as client:
+        while True:
+            task = await loop.run_in_executor(None, tasks.get)
+            if task is None:
+                return
+            index, ids = task
+            try:
+                await _crawl_shard(client, index, ids, results, options)
+            except Exception as error:
+                await loop.run_in_executor(None, results.put, ("failed", index, f"{type(error).__name__}: {error}"))
+                return
+            await loop.run_in_executor(None, results.put, ("finished", index, None))
+
+async def _crawl_shard(
+    client: RawClient,
+    index: int,
+    ids: Sequence[int],
+    results: "multiprocessing.Queue[Tuple[str, int, Any]]",
+    options: Dict[str, Any]
+):
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(options["concurrency"])
+    batch: List[CrawlResult] = []
+
+    async def send():
+        nonlocal batch
+        ready, batch = batch, []
+        await loop.run_in_executor(None, results.put, ("results", index, ready))
+
+    async def fetch(endpoint: Job, user_id: int):
+        async with semaphore:
+            payload = error = None
+            try:
+                if endpoint == "user":
+                    payload = await client.get_details_for_user(user_id)
+                else:
+                    payload = await client.list_maps_by_user(user_id, options["max_version"], options["maps_per_user"])
+            except NotFound:
+                pass
+            except Exception as exception:
+                error = f"{type(exception).__name__}: {exception}"
+        batch.append(CrawlResult(endpoint, user_id, payload, error, index))
+        if len(batch) >= options["batch_size"]:
+            await send()
+
+    await asyncio.gather(*(fetch(endpoint, user_id) for user_id in ids for endpoint in options["endpoints"]))
+    if batch:
+        await send()
\ No newline at end of file
@@ -0,0 +1,24 @@
+from typing import Callable, Any, Union
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+JSONLoads = Callable[[Union[bytes, str]], Any]
+
+def json_loads(body: Union[bytes, str]) -> Any:
+    """Decode a JSON document with the standard library."""
+    return json.loads(body)
+
+def default_loads() -> JSONLoads:
+    """Return the fastest installed JSON decoder.
+
+    :mod:`orjson` is used when it is installed, it decodes straight from the response bytes.
+    The standard library's :func:`json.loads` is used otherwise.
+    """
+    if orjson is not None:
+        return orjson.loads
+    return json_loads
\ No newline at end of file
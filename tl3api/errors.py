@@ -0,0 +1,71 @@
+from typing import Optional
+
+class TL3Exception(Exception):
+    """Base exception for errors raised by tl3api."""
+
+class HTTPException(TL3Exception):
+    """Raised when the API responds with an error status.
+
+    =================================== ================================================
+    Attribute                           Description
+    =================================== ================================================
+    status                              The HTTP status code.
+    url                                 The requested url.
+    body                                The response body.
+    """
+    status: int
+    """The HTTP status code."""
+    url: str
+    """The requested url."""
+    body: bytes
+    """The response body."""
+
+    def __init__(
+        self, 
+        status: int, 
+        url: str, 
+        body: bytes = b""
+    ):
+        self.status = status
+        self.url = url
+        self.body = body
+        super().__init__(f"{status} error for {url}")
+
+class NotFound(HTTPException):
+    """Raised when the requested object doesn't exist (404)."""
+
+class RateLimited(HTTPException):
+    """Raised when the API keeps throttling requests (429) after all retries.
+
+    ``retry_after`` is how long the API asked to wait, in seconds, if it said so.
+    """
+    retry_after: Optional[float]
+    """How long the API asked to wait, in seconds."""
+
+    def __init__(
+        self, 
+        status: int, 
+        url: str, 
+        body: bytes = b"", 
+        retry_after: Optional[float] = None
+    ):
+        super().__init__(status, url, body)
+        self.retry_after = retry_after
+
+class ServerError(HTTPException):
+    """Raised when the API keeps failing with a 5xx status after all retries."""
+
+def http_error(
+    status: int, 
+    url: str, 
+    body: bytes = b"", 
+    retry_after: Optional[float] = None
+) -> HTTPException:
+    """Return the :class:`.HTTPException` subclass matching a status code."""
+    if status == 404:
+        return NotFound(status, url, body)
+    if status == 429:
+        return RateLimited(status, url, body, retry_after)
+    if status >= 500:
+        return ServerError(status, url, body)
+    return HTTPException(status, url, body)
\ No newline at end of file
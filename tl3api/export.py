@@ -0,0 +1,269 @@
+from typing import Optional, Dict, Any, List, Tuple, Type, Union, Iterable, AsyncIterable, IO, Literal
+
+import bz2
+import csv
+import gzip
+import io
+import json
+import lzma
+import os
+
+from tl3api.base import ICObjectBase, convert_key
+
+Format = Literal["jsonl", "csv", "parquet"]
+Kind = Literal["int", "bool", "str"]
+
+_KINDS = {int: "int", bool: "bool", str: "str"}
+_OPENERS = {"gzip": gzip.open, "bz2": bz2.open, "xz": lzma.open}
+_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+
+def schema_for(model: Type[ICObjectBase]) -> Dict[str, Kind]:
+    """Derive column names and kinds from a model's annotated attributes, in declaration order.
+
+    ``object_id`` comes first unless the model declares it itself, ``Literal`` annotations take the kind of their values.
+    """
+    annotations: Dict[str, Any] = {}
+    for klass in reversed(model.__mro__):
+        annotations.update(klass.__dict__.get("__annotations__", {}))
+    own = list(model.__dict__.get("__annotations__", {}))
+    names = own + [name for name in annotations if name not in own]
+    if "object_id" not in own and "object_id" in names:
+        names.remove("object_id")
+        names.insert(0, "object_id")
+
+    schema: Dict[str, Kind] = {}
+    for name in names:
+        if name.startswith("_"):
+            continue
+        annotation = annotations[name]
+        values = getattr(annotation, "__args__", None)
+        if getattr(annotation, "__origin__", None) is Literal and values:
+            annotation = type(values[0])
+        schema[name] = _KINDS.get(annotation, "str")
+    return schema
+
+class BatchWriter:
+    """Superclass for writers of one export format.
+
+    Rows are dicts keyed by the schema's column names, :func:`export` hands them over in batches.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        schema: Dict[str, Kind],
+        compression: Optional[str] = None
+    ):
+        """Initialize a :class:`.BatchWriter` instance.
+
+        :param path: The output file.
+        :param schema: Column names and kinds.
+        :param compression: Compression of the file, format specific.
+        """
+        self.path = path
+        self.schema = schema
+        self.compression = compression
+        self.rows = 0
+
+    def write_batch(self, rows: List[Dict[str, Any]]):
+        """Append rows to the file."""
+        raise NotImplementedError
+
+    def close(self):
+        """Flush and close the file."""
+
+def _open_text(path: str, compression: Optional[str], newline: Optional[str] = None) -> IO[str]:
+    if compression is None:
+        return open(path, "w", encoding="utf-8", newline=newline)
+    if compression not in _OPENERS:
+        raise ValueError(f"unknown compression {compression!r}, expected one of {', '.join(_OPENERS)}")
+    return io.TextIOWrapper(_OPENERS[compression](path, "wb"), encoding="utf-8", newline=newline)
+
+class JSONLinesWriter(BatchWriter):
+    """Writes one JSON object per line, optionally compressed with ``"gzip"``, ``"bz2"`` or ``"xz"``."""
+
+    def __init__(
+        self,
+        path: str,
+        schema: Dict[str, Kind],
+        compression: Optional[str] = None
+    ):
+        super().__init__(path, schema, compression)
+        self._file = _open_text(path, compression)
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+
+    def write_batch(self, rows: List[Dict[str, Any]]):
+        encode = self._encoder.encode
+        self._file.write("".join(encode(row) + "\n" for row in rows))
+        self.rows += len(rows)
+
+    def close(self):
+        self._file.close()
+
+class CSVWriter(BatchWriter):
+    """Writes a CSV file with a header row, optionally compressed with ``"gzip"``, ``"bz2"`` or ``"xz"``.
+
+    Missing values are written as empty fields.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        schema: Dict[str, Kind],
+        compression: Optional[str] = None
+    ):
+        super().__init__(path, schema, compression)
+        self._file = _open_text(path, compression, newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=list(schema))
+        self._writer.writeheader()
+
+    def write_batch(self, rows: List[Dict[str, Any]]):
+        self._writer.writerows(rows)
+        self.rows += len(rows)
+
+    def close(self):
+        self._file.close()
+
+class ParquetWriter(BatchWriter):
+    """Writes a Parquet file with one row group per batch, requires pyarrow.
+
+    ``compression`` is any codec pyarrow supports, e.g. ``"snappy"`` (pyarrow's default) or ``"zstd"``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        schema: Dict[str, Kind],
+        compression: Optional[str] = None
+    ):
+        # Imported here, so importing tl3api doesn't load pyarrow when no Parquet file is written.
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("pyarrow is not installed") from None
+
+        super().__init__(path, schema, compression)
+        types = {"int": pyarrow.int64(), "bool": pyarrow.bool_(), "str": pyarrow.string()}
+        self._schema = pyarrow.schema([(name, types[kind]) for name, kind in schema.items()])
+        options = {"compression": compression} if compression is not None else {}
+        self._writer = pyarrow.parquet.ParquetWriter(path, self._schema, **options)
+        self._from_pylist = pyarrow.Table.from_pylist
+
+    def write_batch(self, rows: List[Dict[str, Any]]):
+        self._writer.write_table(self._from_pylist(rows, schema=self._schema))
+        self.rows += len(rows)
+
+    def close(self):
+        self._writer.close()
+
+WRITERS: Dict[str, Type[BatchWriter]] = {
+    "jsonl": JSONLinesWriter,
+    "csv": CSVWriter,
+    "parquet": ParquetWriter,
+}
+"""Writer class of every export format."""
+
+def _guess(path: str, format: Optional[str], compression: Optional[str]) -> Tuple[str, Optional[str]]:
+    root, suffix = os.path.splitext(path)
+    if suffix in _SUFFIXES:
+        if compression is None:
+            compression = _SUFFIXES[suffix]
+        root, suffix = os.path.splitext(root)
+    if format is None:
+        format = {".jsonl": "jsonl", ".ndjson": "jsonl", ".json": "jsonl", ".csv": "csv", ".parquet": "parquet"}.get(suffix)
+        if format is None:
+            raise ValueError(f"can't tell the export format from {path!r}, pass format")
+    if format not in WRITERS:
+        raise ValueError(f"unknown format {format!r}, expected one of {', '.join(WRITERS)}")
+    return format, compression
+
+class _Rows:
+    """Turns models or raw payloads into rows of one schema."""
+
+    def __init__(self, model: Optional[Type[ICObjectBase]]):
+        self.model = model
+        self.schema = schema_for(model) if model is not None else None
+        self._keys: Dict[str, Optional[str]] = {}
+
+    def row(self, item: Union[ICObjectBase, Dict[str, Any]]) -> Dict[str, Any]:
+        if self.schema is None:
+            if not isinstance(item, ICObjectBase):
+                raise TypeError("exporting raw payloads needs a model to derive the schema from")
+            self.model = type(item)
+            self.schema = schema_for(self.model)
+
+        if isinstance(item, ICObjectBase):
+            return {name: getattr(item, name, None) for name in self.schema}
+
+        keys = self._keys
+        row = dict.fromkeys(self.schema)
+        for key, value in item.items():
+            if key in keys:
+                name = keys[key]
+            else:
+                name = convert_key(key)
+                if name not in self.schema:
+                    name = None
+                keys[key] = name
+            if name is not None:
+                row[name] = value
+        return row
+
+async def export(
+    items: Union[Iterable[Union[ICObjectBase, Dict[str, Any]]], AsyncIterable[Union[ICObjectBase, Dict[str, Any]]]],
+    path: str,
+    format: Optional[Format] = None,
+    model: Optional[Type[ICObjectBase]] = None,
+    compression: Optional[str] = None,
+    batch_size: int = 10000
+) -> int:
+    """Write models or raw payloads to a JSONL, CSV or Parquet file in fixed-size batches.
+
+    ``items`` is consumed lazily, so only one batch is held in memory however many rows are exported. ``None`` items, e.g. missing users, are skipped.
+    Columns follow :func:`schema_for`, fields a model doesn't declare are left out.
+
+    :param items: :class:`.ICObjectBase` instances or camelCase dicts as returned by the API, e.g. ``client.iter_new_maps(...)``.
+    :param path: The output file. ``format`` and ``compression`` are guessed from suffixes like ``.csv.gz`` if omitted.
+    :param format: ``"jsonl"``, ``"csv"`` or ``"parquet"``.
+    :param model: The class whose schema is used, taken from the first item if omitted. Required for raw payloads.
+    :param compression: ``"gzip"``, ``"bz2"`` or ``"xz"`` for JSONL and CSV, a pyarrow codec for Parquet.
+    :param batch_size: Rows per batch, also the Parquet row group size.
+    :return: The amount of exported rows.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1")
+
+    format, compression = _guess(path, format, compression)
+    rows = _Rows(model)
+    writer: Optional[BatchWriter] = None
+    batch: List[Dict[str, Any]] = []
+
+    def flush():
+        nonlocal writer
+        if writer is None:
+            writer = WRITERS[format](path, rows.schema or {}, compression)
+        if batch:
+            writer.write_batch(batch)
+            batch.clear()
+
+    try:
+        if hasattr(items, "__aiter__"):
+            async for item in items:
+                if item is None:
+                    continue
+                batch.append(rows.row(item))
+                if len(batch) >= batch_size:
+                    flush()
+        else:
+            for item in items:
+                if item is None:
+                    continue
+                batch.append(rows.row(item))
+                if len(batch) >= batch_size:
+                    flush()
+        flush()
+    finally:
+        if writer is not None:
+            writer.close()
+    return writer.rows
\ No newline at end of file
@@ -0,0 +1,18 @@
+from typing import Any
+
+import json
+import os
+
+def write_atomically(path: str, data: bytes):
+    """Replace the content of a file in one step.
+
+    The data is written to ``<path>.tmp`` first and moved over ``path``, so a crash leaves either the old or the new file, never a partial one.
+    """
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(data)
+    os.replace(temporary, path)
+
+def write_json(path: str, state: Any):
+    """Write a compact JSON document with :func:`write_atomically`."""
+    write_atomically(path, json.dumps(state, separators=(",", ":")).encode())
\ No newline at end of file
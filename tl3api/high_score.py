@@ -19,6 +19,8 @@ class HighScore(ICObjectBase):
     object_id                           ID of the :class:`.HighScore`.
     username                            Name of the author.
     """
+    __slots__ = ("user_id", "map_id", "score", "map_version", "date_made", "username")
+
     user_id: int
     """ID of the author."""
     map_id: int
@@ -31,13 +33,13 @@ class HighScore(ICObjectBase):
     """Timestamp of when the :class:`.HighScore` was made."""
     object_id: int
     """ID of the :class:`.HighScore`."""
-    username: int
+    username: str
     """Name of the author."""
 
     async def get_author(self) -> "User":
         """Return the :class:`.HighScore` author."""
-        return await self._client.get_details_for_user(user_id=self.user_id)
+        return await self._client.resolve_user(user_id=self.user_id)
 
     async def get_map(self) -> "Map":
         """Return the :class:`.Map` on which the :class:`.HighScore` was made."""
-        return await self._client.get_map_details(map_id=self.map_id)
\ No newline at end of file
+        return await self._client.resolve_map(map_id=self.map_id)
\ No newline at end of file
@@ -0,0 +1,114 @@
+from typing import Optional, Type, Tuple, TypeVar
+from collections import OrderedDict
+
+import weakref
+
+from tl3api.base import ICObjectBase
+
+T = TypeVar("T", bound=ICObjectBase)
+
+class IdentityMap:
+    """Maps ``(class, object_id)`` to the single live instance a :class:`.Client` hands out.
+
+    Instances stay reachable as long as anything references them, and the ``maxsize`` most recently seen ones are also kept alive by the map itself.
+    When a fresh copy of a known object is fetched, the live instance is updated in place and returned instead.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 1024
+    ):
+        """Initialize an :class:`.IdentityMap` instance.
+
+        :param maxsize: Amount of recently seen objects kept alive even when nothing else references them, ``0`` to only track live ones.
+        """
+        if maxsize < 0:
+            raise ValueError("maxsize can't be negative")
+
+        self.maxsize = maxsize
+        self._live: "weakref.WeakValueDictionary[Tuple[type, int], ICObjectBase]" = weakref.WeakValueDictionary()
+        self._recent: "OrderedDict[Tuple[type, int], ICObjectBase]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def get(
+        self,
+        cls: Type[T],
+        object_id: int
+    ) -> Optional[T]:
+        """Return the live instance of an object, if there is one.
+
+        :param cls: The object's class.
+        :param object_id: The object's ID.
+        """
+        key = (cls, object_id)
+        obj = self._live.get(key)
+        if obj is not None:
+            self._remember(key, obj)
+        return obj
+
+    def add(
+        self,
+        obj: T
+    ) -> T:
+        """Register an object and return the canonical instance for its ID.
+
+        If another instance with the same ID is alive it receives ``obj``'s attributes and is returned.
+
+        :param obj: A freshly built object.
+        """
+        object_id = getattr(obj, "object_id", None)
+        if object_id is None:
+            return obj
+
+        key = (type(obj), object_id)
+        current = self._live.get(key)
+        if current is None or current is obj:
+            current = obj
+            self._live[key] = obj
+        else:
+            _merge(current, obj)
+
+        self._remember(key, current)
+        return current
+
+    def discard(
+        self,
+        cls: Type[ICObjectBase],
+        object_id: int
+    ):
+        """Forget an object."""
+        key = (cls, object_id)
+        self._live.pop(key, None)
+        self._recent.pop(key, None)
+
+    def clear(self):
+        """Forget every object."""
+        self._live.clear()
+        self._recent.clear()
+
+    def _remember(
+        self,
+        key: Tuple[type, int],
+        obj: ICObjectBase
+    ):
+        if not self.maxsize:
+            return
+        self._recent[key] = obj
+        self._recent.move_to_end(key)
+        while len(self._recent) > self.maxsize:
+            self._recent.popitem(last=False)
+
+def _merge(
+    target: ICObjectBase,
+    source: ICObjectBase
+):
+    for name in type(source)._fields:
+        try:
+            value = getattr(source, name)
+        except AttributeError:
+            continue
+        setattr(target, name, value)
+    if source._extra:
+        target._extra = dict(target._extra or {}, **source._extra)
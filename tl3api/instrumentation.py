@@ -0,0 +1,228 @@
+from typing import Optional, Dict, List, Tuple, Sequence, Deque, Literal
+from collections import deque
+
+import bisect
+import threading
+
+Source = Literal["network", "cache", "stale", "store", "coalesced"]
+
+class RequestEvent:
+    """Measurements of a single :class:`.Client` request, passed to every :class:`.Observer`.
+
+    Times are in seconds. Fields that don't apply, e.g. ``status`` for a cache hit, are ``None``.
+
+    =================================== ================================================
+    Attribute                           Description
+    =================================== ================================================
+    endpoint                            Name of the endpoint, e.g. ``"top_maps"``.
+    url                                 The requested url.
+    source                              Where the response came from: ``"network"``,
+                                        ``"cache"``, ``"stale"``, ``"store"`` or
+                                        ``"coalesced"`` (shared with a concurrent call).
+    status                              HTTP status of the last attempt.
+    attempts                            Amount of HTTP attempts, retries included.
+    ttfb                                Time until the response headers arrived, for the
+                                        last attempt.
+    latency                             Total time of the call, construction included.
+    response_bytes                      Size of the response body.
+    decode_time                         Time spent decoding JSON.
+    build_time                          Time spent building objects or tables.
+    error                               The exception the call raised, if any.
+    """
+    __slots__ = (
+        "endpoint", "url", "source", "status", "attempts", "ttfb", "latency", "response_bytes", "decode_time",
+        "build_time", "error"
+    )
+
+    def __init__(
+        self,
+        endpoint: str,
+        url: str
+    ):
+        self.endpoint = endpoint
+        self.url = url
+        self.source: Source = "network"
+        self.status: Optional[int] = None
+        self.attempts = 0
+        self.ttfb: Optional[float] = None
+        self.latency = 0.0
+        self.response_bytes: Optional[int] = None
+        self.decode_time = 0.0
+        self.build_time = 0.0
+        self.error: Optional[BaseException] = None
+
+    def __repr__(self) -> str:
+        return (
+            f"<RequestEvent endpoint={self.endpoint!r} source={self.source!r} status={self.status} "
+            f"latency={self.latency:.4f}>"
+        )
+
+class Observer:
+    """Superclass for objects receiving a :class:`.RequestEvent` after every :class:`.Client` request.
+
+    Attach instances with the ``observers`` argument of :class:`.Client` or :meth:`.Client.add_observer`.
+    Observers run inline, so they should be quick.
+    """
+
+    def on_request(self, event: RequestEvent):
+        """Called once per request, after the response was built or the call failed."""
+
+DEFAULT_TIME_BUCKETS: Tuple[float, ...] = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+"""Histogram bucket bounds in seconds used by :class:`.MetricsObserver`."""
+
+class Histogram:
+    """A cumulative histogram with fixed buckets, plus a window of the latest samples for quantiles."""
+    __slots__ = ("bounds", "counts", "count", "sum", "recent")
+
+    def __init__(
+        self,
+        bounds: Sequence[float] = DEFAULT_TIME_BUCKETS,
+        window: int = 1024
+    ):
+        """Initialize a :class:`.Histogram` instance.
+
+        :param bounds: Upper bounds of the buckets, in increasing order.
+        :param window: Amount of latest samples kept for :meth:`quantile`.
+        """
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+    def observe(self, value: float):
+        """Record a sample."""
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Return the ``q`` quantile (0 to 1) of the latest samples, ``None`` without samples."""
+        if not self.recent:
+            return None
+        ordered = sorted(self.recent)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+class MetricsObserver(Observer):
+    """An :class:`.Observer` keeping per-endpoint histograms and counters.
+
+    :meth:`snapshot` summarizes the latest requests and :meth:`export_prometheus` renders everything in the Prometheus text exposition format.
+    """
+    HISTOGRAMS = {
+        "request_duration_seconds": "Total duration of client calls.",
+        "time_to_first_byte_seconds": "Time until the response headers arrived.",
+        "decode_seconds": "Time spent decoding JSON.",
+        "build_seconds": "Time spent building objects.",
+    }
+
+    def __init__(
+        self,
+        namespace: str = "tl3api",
+        buckets: Sequence[float] = DEFAULT_TIME_BUCKETS,
+        window: int = 1024
+    ):
+        """Initialize a :class:`.MetricsObserver` instance.
+
+        :param namespace: Prefix of the exported metric names.
+        :param buckets: Histogram bucket bounds in seconds.
+        :param window: Amount of latest samples per endpoint kept for quantiles.
+        """
+        self.namespace = namespace
+        self.buckets = tuple(buckets)
+        self.window = window
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._requests: Dict[Tuple[str, str, str], int] = {}
+        self._bytes: Dict[str, int] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def _histogram(self, metric: str, endpoint: str) -> Histogram:
+        key = (metric, endpoint)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = Histogram(self.buckets, self.window)
+        return histogram
+
+    def on_request(self, event: RequestEvent):
+        endpoint = event.endpoint
+        with self._lock:
+            self._histogram("request_duration_seconds", endpoint).observe(event.latency)
+            if event.ttfb is not None:
+                self._histogram("time_to_first_byte_seconds", endpoint).observe(event.ttfb)
+            if event.decode_time:
+                self._histogram("decode_seconds", endpoint).observe(event.decode_time)
+            if event.build_time:
+                self._histogram("build_seconds", endpoint).observe(event.build_time)
+
+            key = (endpoint, str(event.status) if event.status is not None else "", event.source)
+            self._requests[key] = self._requests.get(key, 0) + 1
+            if event.response_bytes:
+                self._bytes[endpoint] = self._bytes.get(endpoint, 0) + event.response_bytes
+            if event.error is not None:
+                error = (endpoint, type(event.error).__name__)
+                self._errors[error] = self._errors.get(error, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Summarize the latest requests of every endpoint.
+
+        :return: Per endpoint, the request count and the p50 / p99 of the latency, time to first byte, decode and build time.
+        """
+        with self._lock:
+            summary: Dict[str, Dict[str, Optional[float]]] = {}
+            for (metric, endpoint), histogram in sorted(self._histograms.items()):
+                name = metric.rsplit("_", 1)[0]
+                entry = summary.setdefault(endpoint, {})
+                if metric == "request_duration_seconds":
+                    entry["requests"] = histogram.count
+                entry[f"{name}_p50"] = histogram.quantile(0.5)
+                entry[f"{name}_p99"] = histogram.quantile(0.99)
+            return summary
+
+    def export_prometheus(self) -> str:
+        """Render every metric in the Prometheus text exposition format."""
+        ns = self.namespace
+        lines: List[str] = []
+        with self._lock:
+            for metric, description in self.HISTOGRAMS.items():
+                series = sorted((endpoint, h) for (m, endpoint), h in self._histograms.items() if m == metric)
+                if not series:
+                    continue
+                name = f"{ns}_{metric}"
+                lines.append(f"# HELP {name} {description}")
+                lines.append(f"# TYPE {name} histogram")
+                for endpoint, histogram in series:
+                    label = f'endpoint="{_escape(endpoint)}"'
+                    cumulative = 0
+                    for bound, count in zip(histogram.bounds, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{label},le="{bound:g}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{{label},le="+Inf"}} {histogram.count}')
+                    lines.append(f"{name}_sum{{{label}}} {histogram.sum!r}")
+                    lines.append(f"{name}_count{{{label}}} {histogram.count}")
+
+            if self._requests:
+                name = f"{ns}_requests_total"
+                lines.append(f"# HELP {name} Client calls by endpoint, status and response source.")
+                lines.append(f"# TYPE {name} counter")
+                for (endpoint, status, source), count in sorted(self._requests.items()):
+                    lines.append(f'{name}{{endpoint="{_escape(endpoint)}",status="{status}",source="{source}"}} {count}')
+
+            if self._bytes:
+                name = f"{ns}_response_bytes_total"
+                lines.append(f"# HELP {name} Response body bytes received.")
+                lines.append(f"# TYPE {name} counter")
+                for endpoint, count in sorted(self._bytes.items()):
+                    lines.append(f'{name}{{endpoint="{_escape(endpoint)}"}} {count}')
+
+            if self._errors:
+                name = f"{ns}_errors_total"
+                lines.append(f"# HELP {name} Failed client calls by exception type.")
+                lines.append(f"# TYPE {name} counter")
+                for (endpoint, error), count in sorted(self._errors.items()):
+                    lines.append(f'{name}{{endpoint="{_escape(endpoint)}",error="{_escape(error)}"}} {count}')
+
+        return "\n".join(lines) + "\n"
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
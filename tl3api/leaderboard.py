@@ -0,0 +1,311 @@
+from typing import TYPE_CHECKING, Optional, Dict, List, Tuple, Set, Iterable, Any, Literal
+
+import asyncio
+import heapq
+import json
+import os
+
+from tl3api.errors import NotFound
+from tl3api.files import write_json
+from tl3api.high_score import HighScore
+from tl3api.map import Map
+
+if TYPE_CHECKING:
+    from tl3api.wrapper import Client
+
+Metric = Literal["firsts", "total", "maps"]
+Entry = Tuple[int, int, int, int]
+
+_METRICS = {"maps": 0, "firsts": 1, "total": 2}
+
+class _Partition:
+    """Per-user ``[maps, firsts, total]`` of one map version, or of all versions, with a lazy top-k heap per metric."""
+
+    def __init__(self):
+        self.stats: Dict[int, List[int]] = {}
+        self.heaps: Tuple[List[Tuple[int, int]], ...] = ([], [], [])
+        self._dirty: Set[int] = set()
+
+    def change(
+        self,
+        user_id: int,
+        maps: int,
+        firsts: int,
+        total: int
+    ):
+        stats = self.stats.get(user_id)
+        if stats is None:
+            stats = self.stats[user_id] = [0, 0, 0]
+        stats[0] += maps
+        stats[1] += firsts
+        stats[2] += total
+        if not stats[0]:
+            del self.stats[user_id]
+        self._dirty.add(user_id)
+
+    def top(
+        self,
+        metric: int,
+        k: int
+    ) -> List[Tuple[int, int]]:
+        self._push_dirty()
+        heap = self.heaps[metric]
+        if len(heap) > 2 * len(self.stats) + 64:
+            # Mostly stale entries, rebuild from the current values.
+            heap[:] = [(-stats[metric], user_id) for user_id, stats in self.stats.items()]
+            heapq.heapify(heap)
+
+        found: List[Tuple[int, int]] = []
+        kept: List[Tuple[int, int]] = []
+        seen: Set[int] = set()
+        while heap and len(found) < k:
+            entry = heapq.heappop(heap)
+            value, user_id = -entry[0], entry[1]
+            stats = self.stats.get(user_id)
+            # Entries of older values are dropped, the current value has an entry of its own.
+            if stats is None or stats[metric] != value or user_id in seen:
+                continue
+            if value <= 0:
+                kept.append(entry)
+                break
+            seen.add(user_id)
+            found.append((user_id, value))
+            kept.append(entry)
+        for entry in kept:
+            heapq.heappush(heap, entry)
+        return found
+
+    def _push_dirty(self):
+        for user_id in self._dirty:
+            stats = self.stats.get(user_id)
+            if stats is not None:
+                for metric, heap in enumerate(self.heaps):
+                    heapq.heappush(heap, (-stats[metric], user_id))
+        self._dirty.clear()
+
+class Leaderboard:
+    """Aggregates :class:`.HighScore`\\s of many maps into player rankings, updated incrementally.
+
+    Every map's board is kept as its best score per user and map version.
+    Each board contributes to the per-user ``maps`` (maps with a score), ``firsts`` (#1 finishes) and ``total`` (sum of best scores) of the partition of every map version on it and of the partition of all versions.
+    Replacing a board only subtracts its old contribution and adds the new one, rankings are read from lazy top-k heaps instead of rescanning.
+
+    :meth:`refresh` only fetches maps whose ``high_score`` or ``updated`` changed since their last fetch.
+    The boards and those signatures are kept in a JSON checkpoint, the aggregates are rebuilt from it on start.
+    """
+
+    def __init__(
+        self,
+        client: "Client",
+        checkpoint: Optional[str] = None,
+        count: int = 100,
+        concurrency: int = 10
+    ):
+        """Initialize a :class:`.Leaderboard` instance.
+
+        :param client: The :class:`.Client` making the requests.
+        :param checkpoint: Path of the JSON checkpoint file, the state is only kept in memory if omitted.
+        :param count: :class:`.HighScore`\\s requested per map.
+        :param concurrency: Maximum amount of simultaneous requests.
+        """
+        if count < 1 or concurrency < 1:
+            raise ValueError("count and concurrency must be at least 1")
+
+        self.client = client
+        self.checkpoint = checkpoint
+        self.count = count
+        self.concurrency = concurrency
+        self.names: Dict[int, str] = {}
+        """Last seen name of every user ID."""
+        self._boards: Dict[int, List[Entry]] = {}
+        self._signatures: Dict[int, Tuple[int, int]] = {}
+        self._partitions: Dict[Optional[int], _Partition] = {None: _Partition()}
+        self._load_state()
+
+    def __len__(self) -> int:
+        return len(self._boards)
+
+    async def refresh(
+        self,
+        maps: Iterable[Map],
+        force: bool = False
+    ) -> Dict[str, int]:
+        """Fetch the :class:`.HighScore`\\s of the maps whose ``high_score`` or ``updated`` changed and update the aggregates.
+
+        :param maps: Current :class:`.Map` objects, e.g. from :meth:`.Client.list_new_maps` or a :class:`.CatalogSync` sink.
+        :param force: Fetch every map, changed or not.
+        :return: Amount of ``fetched``, ``skipped`` (unchanged), ``missing`` (404, their boards are dropped) and ``failed`` maps.
+        """
+        stats = dict.fromkeys(("fetched", "skipped", "missing", "failed"), 0)
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(_map: Map):
+            signature = _signature(_map)
+            if not force and self._signatures.get(_map.object_id) == signature:
+                stats["skipped"] += 1
+                return
+            async with semaphore:
+                try:
+                    high_scores = [high_score async for high_score in self.client.stream_high_scores_on_map(_map.object_id, self.count)]
+                except NotFound:
+                    self.remove(_map.object_id)
+                    stats["missing"] += 1
+                    return
+                except Exception:
+                    stats["failed"] += 1
+                    return
+            self.update(_map.object_id, high_scores, signature)
+            stats["fetched"] += 1
+
+        await asyncio.gather(*(fetch(_map) for _map in {_map.object_id: _map for _map in maps}.values()))
+        self._save()
+        return stats
+
+    def update(
+        self,
+        map_id: int,
+        high_scores: Iterable[HighScore],
+        signature: Optional[Tuple[int, int]] = None
+    ):
+        """Replace the board of a map with freshly fetched :class:`.HighScore`\\s.
+
+        :param map_id: ID of the :class:`.Map`.
+        :param high_scores: Its complete :class:`.HighScore` list.
+        :param signature: ``(high_score, updated)`` of the :class:`.Map` they were fetched for, makes :meth:`refresh` skip it until either changes.
+        """
+        best: Dict[Tuple[int, int], Entry] = {}
+        for high_score in high_scores:
+            user_id = high_score.user_id
+            entry = (high_score.score, -(getattr(high_score, "date_made", 0) or 0), user_id, getattr(high_score, "map_version", 0) or 0)
+            key = (user_id, entry[3])
+            if key not in best or entry > best[key]:
+                best[key] = entry
+            username = getattr(high_score, "username", None)
+            if username:
+                self.names[user_id] = username
+
+        self._apply(map_id, -1)
+        self._boards[map_id] = sorted(best.values(), reverse=True)
+        self._apply(map_id, 1)
+        if signature is not None:
+            self._signatures[map_id] = signature
+        else:
+            self._signatures.pop(map_id, None)
+
+    def remove(
+        self,
+        map_id: int
+    ) -> bool:
+        """Drop the board of a map, return whether it was known."""
+        self._signatures.pop(map_id, None)
+        if map_id not in self._boards:
+            return False
+        self._apply(map_id, -1)
+        del self._boards[map_id]
+        return True
+
+    def top(
+        self,
+        metric: Metric = "firsts",
+        k: int = 10,
+        map_version: Optional[int] = None
+    ) -> List[Tuple[int, int]]:
+        """Return the ``k`` best users by a metric as ``(user_id, value)`` pairs, ties go to the lower ID.
+
+        Users whose value is 0 aren't ranked.
+
+        :param metric: ``"firsts"`` (#1 finishes), ``"total"`` (sum of best scores) or ``"maps"`` (maps with a score).
+        :param k: Maximum amount of users.
+        :param map_version: Only count scores made on this map version, all versions if omitted.
+        """
+        if metric not in _METRICS:
+            raise ValueError(f"unknown metric {metric!r}, expected one of {', '.join(_METRICS)}")
+        partition = self._partitions.get(map_version)
+        return partition.top(_METRICS[metric], k) if partition is not None else []
+
+    def user(
+        self,
+        user_id: int,
+        map_version: Optional[int] = None
+    ) -> Dict[str, int]:
+        """Return the ``maps``, ``firsts`` and ``total`` of a user, see :meth:`top`."""
+        partition = self._partitions.get(map_version)
+        stats = partition.stats.get(user_id) if partition is not None else None
+        return dict(zip(_METRICS, stats or (0, 0, 0)))
+
+    def board(
+        self,
+        map_id: int,
+        k: Optional[int] = None,
+        map_version: Optional[int] = None
+    ) -> List[Tuple[int, int]]:
+        """Return the best ``(user_id, score)`` pairs of one map, each user once.
+
+        :param map_id: ID of the :class:`.Map`.
+        :param k: Maximum amount of users, all if omitted.
+        :param map_version: Only rank scores made on this map version.
+        """
+        return [(user_id, score) for user_id, score, _ in self._ranked(self._boards.get(map_id, []), map_version)][:k]
+
+    def map_versions(self) -> List[int]:
+        """Return the map versions that have a partition."""
+        return sorted(version for version, partition in self._partitions.items() if version is not None and partition.stats)
+
+    @staticmethod
+    def _ranked(
+        entries: List[Entry],
+        map_version: Optional[int]
+    ) -> List[Tuple[int, int, int]]:
+        # Entries are sorted best first, so the first entry of a user is their best.
+        seen: Set[int] = set()
+        ranked: List[Tuple[int, int, int]] = []
+        for score, _, user_id, version in entries:
+            if (map_version is None or version == map_version) and user_id not in seen:
+                seen.add(user_id)
+                ranked.append((user_id, score, version))
+        return ranked
+
+    def _apply(
+        self,
+        map_id: int,
+        sign: int
+    ):
+        entries = self._boards.get(map_id)
+        if not entries:
+            return
+        partitions = self._partitions
+        versions = {None}.union(entry[3] for entry in entries)
+        for version in versions:
+            partition = partitions.get(version)
+            if partition is None:
+                partition = partitions[version] = _Partition()
+            for rank, (user_id, score, _) in enumerate(self._ranked(entries, version)):
+                partition.change(user_id, sign, sign if rank == 0 else 0, sign * score)
+
+    def _load_state(self):
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return
+        with open(self.checkpoint, "r", encoding="utf-8") as file:
+            state: Dict[str, Any] = json.load(file)
+        if state.get("version") != 1:
+            return
+        self.names = {int(user_id): name for user_id, name in state["names"].items()}
+        for map_id, (signature, entries) in state["maps"].items():
+            map_id = int(map_id)
+            self._boards[map_id] = [tuple(entry) for entry in entries]
+            if signature is not None:
+                self._signatures[map_id] = tuple(signature)
+            self._apply(map_id, 1)
+
+    def _save(self):
+        if self.checkpoint is None:
+            return
+        state = {
+            "version": 1,
+            "names": self.names,
+            "maps": {map_id: [self._signatures.get(map_id), entries] for map_id, entries in self._boards.items()},
+        }
+        write_json(self.checkpoint, state)
+
+def _signature(_map: Map) -> Tuple[int, int]:
+    return (getattr(_map, "high_score", 0) or 0, getattr(_map, "updated", 0) or 0)
\ No newline at end of file
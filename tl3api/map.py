@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, Literal, Optional, List
+from typing import TYPE_CHECKING, Literal, Optional, List, AsyncIterator
 from tl3api.base import ICObjectBase
 
 if TYPE_CHECKING:
@@ -37,6 +37,12 @@ class Map(ICObjectBase):
     object_id                           ID of the :class:`.Map`.
     author_name                         Name of the :class:`.Map` author.
     """
+    __slots__ = (
+        "name", "desc", "game_mode_group", "file_name", "file_ext", "author", "created", "updated", 
+        "game_version", "votes_up", "votes_down", "high_score", "high_score_user", "fully_uploaded", 
+        "map_version", "target_score", "favorites", "deleted", "author_name"
+    )
+
     name: str
     """The name of the :class:`.Map`."""
     desc: str
@@ -79,14 +85,14 @@ class Map(ICObjectBase):
 
     async def get_author(self) -> "User":
         """Return the author :class:`.User` object."""
-        return await self._client.get_details_for_user(user_id=self.author)
+        return await self._client.resolve_user(user_id=self.author)
 
     async def get_high_score_user(self) -> Optional["User"]:
-        """Return the high score :class:`.User`."""
-        try:
-            return await self._client.get_details_for_user(user_id=self.high_score_user)
-        except:
-            None
+        """Return the high score :class:`.User`, ``None`` if nobody has set a high score."""
+        high_score_user = getattr(self, "high_score_user", None)
+        if not high_score_user:
+            return None
+        return await self._client.resolve_user(user_id=high_score_user)
 
     def get_thumbnail_url(self) -> str:
         """Return the :class:`.Map`'s thumbnail url."""
@@ -100,6 +106,14 @@ class Map(ICObjectBase):
         """Return :class:`.Comment`s under this :class:`.Map`."""
         return await self._client.list_comments_on_map(map_id=self.object_id, limit=limit, before=before)
 
+    def iter_comments(
+        self, 
+        limit: int = 50, 
+        max_items: Optional[int] = None
+    ) -> AsyncIterator["Comment"]:
+        """Iterate over every :class:`.Comment` under this :class:`.Map`, fetching pages of ``limit`` in the background."""
+        return self._client.iter_comments(map_id=self.object_id, limit=limit, max_items=max_items)
+
     async def get_high_scores(
         self, 
         count: int
@@ -0,0 +1,56 @@
+from typing import TypeVar, Callable, Awaitable, List, Optional, AsyncIterator, Any
+
+import asyncio
+
+T = TypeVar("T")
+
+async def paginate(
+    fetch_page: Callable[[Any], Awaitable[List[T]]],
+    first_cursor: Any,
+    next_cursor: Callable[[Any, List[T]], Any],
+    page_size: int,
+    max_items: Optional[int] = None
+) -> AsyncIterator[T]:
+    """Iterate over the items of a paged endpoint.
+
+    The next page is requested in the background as soon as the current one arrives, so network time overlaps with whatever the caller does with the items.
+    Iteration stops on a short or empty page, or once ``max_items`` items have been yielded.
+
+    :param fetch_page: Coroutine function returning the items for a cursor.
+    :param first_cursor: Cursor of the first page.
+    :param next_cursor: Function returning the cursor that follows a page, given its cursor and items.
+    :param page_size: Amount of items requested per page.
+    :param max_items: Maximum amount of items to yield, unlimited if omitted.
+    """
+    if page_size < 1:
+        raise ValueError("page_size must be at least 1")
+    if max_items is not None and max_items <= 0:
+        return
+
+    remaining = max_items
+    pending: "Optional[asyncio.Future[List[T]]]" = asyncio.ensure_future(fetch_page(first_cursor))
+    cursor = first_cursor
+
+    try:
+        while pending is not None:
+            items = await pending
+            pending = None
+
+            last = len(items) < page_size or (remaining is not None and remaining <= len(items))
+            if not last:
+                cursor = next_cursor(cursor, items)
+                pending = asyncio.ensure_future(fetch_page(cursor))
+
+            for item in items:
+                yield item
+                if remaining is not None:
+                    remaining -= 1
+                    if remaining == 0:
+                        return
+    finally:
+        if pending is not None:
+            if not pending.done():
+                pending.cancel()
+            elif not pending.cancelled():
+                # Retrieve the error of a prefetch nobody is going to await.
+                pending.exception()
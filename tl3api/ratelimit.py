@@ -0,0 +1,247 @@
+from typing import Optional, FrozenSet, Literal
+
+import asyncio
+import email.utils
+import multiprocessing
+import multiprocessing.context
+import random
+import time
+
+Outcome = Literal["success", "throttled", "error"]
+
+class TokenBucket:
+    """A token bucket pacing requests to a steady rate with bursts.
+
+    A single instance can be shared by several :class:`.Client`\\s to give them a common budget.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None
+    ):
+        """Initialize a :class:`.TokenBucket` instance.
+
+        :param rate: Tokens added per second, i.e. the sustained requests per second.
+        :param burst: Maximum amount of tokens that can pile up, defaults to ``rate``.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.rate = rate
+        self.capacity = max(1.0, burst if burst is not None else rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until ``tokens`` tokens are available and take them. Waiters are served in order."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._paused_until - now
+                if wait <= 0:
+                    if self._tokens >= tokens:
+                        self._tokens -= tokens
+                        return
+                    wait = (tokens - self._tokens) / self.rate
+                await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hand out no tokens for ``seconds``, e.g. after the API sent a Retry-After header."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+class SharedTokenBucket:
+    """A :class:`.TokenBucket` whose budget is shared by several processes.
+
+    The state lives in shared memory, pass the instance to child processes when starting them, e.g. as a :class:`multiprocessing.Process` argument.
+    Waiters are not served in order across processes.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: Optional[float] = None,
+        context: Optional[multiprocessing.context.BaseContext] = None
+    ):
+        """Initialize a :class:`.SharedTokenBucket` instance.
+
+        :param rate: Tokens added per second, i.e. the sustained requests per second of all processes together.
+        :param burst: Maximum amount of tokens that can pile up, defaults to ``rate``.
+        :param context: The multiprocessing context the processes are started with.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        context = context or multiprocessing.get_context()
+        self.rate = rate
+        self.capacity = max(1.0, burst if burst is not None else rate)
+        # tokens, last refill and end of a pause, guarded by one lock
+        self._state = context.Array("d", [self.capacity, time.monotonic(), 0.0])
+
+    def _take(self, tokens: float) -> float:
+        with self._state.get_lock():
+            state = self._state
+            now = time.monotonic()
+            state[0] = min(self.capacity, state[0] + (now - state[1]) * self.rate)
+            state[1] = now
+            wait = state[2] - now
+            if wait > 0:
+                return wait
+            if state[0] >= tokens:
+                state[0] -= tokens
+                return 0.0
+            return (tokens - state[0]) / self.rate
+
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until ``tokens`` tokens are available and take them."""
+        while True:
+            wait = self._take(tokens)
+            if wait <= 0:
+                return
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hand out no tokens to any process for ``seconds``."""
+        with self._state.get_lock():
+            self._state[2] = max(self._state[2], time.monotonic() + seconds)
+
+class AdaptiveConcurrency:
+    """Limits requests in flight and adapts the limit with AIMD.
+
+    Every successful request raises the limit by ``increase / limit``, roughly ``increase`` per round trip of a full window.
+    Every throttled request multiplies it by ``decrease``.
+    """
+
+    def __init__(
+        self,
+        initial: int = 8,
+        minimum: int = 1,
+        maximum: int = 64,
+        increase: float = 1.0,
+        decrease: float = 0.5
+    ):
+        """Initialize an :class:`.AdaptiveConcurrency` instance.
+
+        :param initial: Starting limit.
+        :param minimum: The limit never drops below this.
+        :param maximum: The limit never rises above this.
+        :param increase: Additive increase per window of successful requests.
+        :param decrease: Multiplicative decrease applied when a request is throttled.
+        """
+        if not 1 <= minimum <= initial <= maximum:
+            raise ValueError("expected 1 <= minimum <= initial <= maximum")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._condition: Optional[asyncio.Condition] = None
+
+    @property
+    def limit(self) -> int:
+        """The current concurrency limit."""
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Amount of requests currently holding a slot."""
+        return self._in_flight
+
+    async def acquire(self):
+        """Wait for a free slot."""
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < int(self._limit))
+            self._in_flight += 1
+
+    async def release(self, outcome: Outcome):
+        """Free a slot and adapt the limit.
+
+        :param outcome: ``"success"``, ``"throttled"`` or ``"error"``. Errors leave the limit unchanged.
+        """
+        self._in_flight -= 1
+        if outcome == "success":
+            self._limit = min(float(self.maximum), self._limit + self.increase / self._limit)
+        elif outcome == "throttled":
+            self._limit = max(float(self.minimum), self._limit * self.decrease)
+
+        if self._condition is not None:
+            async with self._condition:
+                self._condition.notify_all()
+
+class RetryPolicy:
+    """Decides whether and when a failed GET request is retried.
+
+    Delays grow exponentially with full jitter, unless the API sent a Retry-After header, which is honoured.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        statuses: FrozenSet[int] = frozenset({429, 500, 502, 503, 504})
+    ):
+        """Initialize a :class:`.RetryPolicy` instance.
+
+        :param max_retries: Retries after the first attempt.
+        :param base_delay: Upper bound of the first delay in seconds.
+        :param max_delay: Upper bound of any delay in seconds, Retry-After included.
+        :param statuses: HTTP statuses worth retrying.
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.statuses = frozenset(statuses)
+
+    def should_retry(
+        self,
+        attempt: int,
+        status: Optional[int] = None
+    ) -> bool:
+        """Whether to retry after the ``attempt``-th failed try (starting at 0).
+
+        :param attempt: The failed attempt's number.
+        :param status: The response status, ``None`` for connection errors and timeouts.
+        """
+        return attempt < self.max_retries and (status is None or status in self.statuses)
+
+    def delay(
+        self,
+        attempt: int,
+        retry_after: Optional[float] = None
+    ) -> float:
+        """Seconds to wait before retrying after the ``attempt``-th failed try."""
+        if retry_after is not None:
+            return min(self.max_delay, max(0.0, retry_after))
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header, given either in seconds or as an HTTP date."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - time.time())
@@ -0,0 +1,283 @@
+from typing import Optional, Dict, List, Tuple, Set, Iterable, Union, Any, Literal
+
+import bisect
+import json
+import re
+import zlib
+
+from tl3api.files import write_atomically
+from tl3api.map import Map
+from tl3api.user import User
+from tl3api.sync import Sink
+
+Kind = Literal["map", "user"]
+
+_TOKEN = re.compile(r"\w+")
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase word tokens."""
+    return _TOKEN.findall(text.lower()) if text else []
+
+class SearchHit:
+    """A :class:`.Map` or :class:`.User` found by a :class:`.SearchIndex`.
+
+    =================================== ================================================
+    Attribute                           Description
+    =================================== ================================================
+    kind                                ``"map"`` or ``"user"``.
+    object_id                           ID of the :class:`.Map` or :class:`.User`.
+    name                                Its name.
+    author_name                         Name of the :class:`.Map` author, ``None`` for
+                                        users.
+    game_mode_group                     Game mode of the :class:`.Map`, ``None`` for
+                                        users.
+    game_version                        Game version of the :class:`.Map` or
+                                        :class:`.User`.
+    score                               Ranking score, ``votes_up - votes_down +
+                                        favorites`` for maps and ``followers`` for users.
+    """
+    __slots__ = ("kind", "object_id", "name", "author_name", "game_mode_group", "game_version", "score")
+
+    def __init__(
+        self,
+        kind: Kind,
+        object_id: int,
+        name: str,
+        author_name: Optional[str],
+        game_mode_group: Optional[int],
+        game_version: int,
+        score: int
+    ):
+        self.kind = kind
+        self.object_id = object_id
+        self.name = name
+        self.author_name = author_name
+        self.game_mode_group = game_mode_group
+        self.game_version = game_version
+        self.score = score
+
+    def __repr__(self) -> str:
+        return f"<SearchHit kind={self.kind!r} object_id={self.object_id} name={self.name!r} score={self.score}>"
+
+class _Corpus:
+    """Documents of one kind with their postings and sorted vocabulary."""
+
+    def __init__(self):
+        self.documents: Dict[int, Tuple[SearchHit, Tuple[str, ...], Tuple[str, ...]]] = {}
+        self.postings: Dict[str, Set[int]] = {}
+        self.vocabulary: List[str] = []
+
+    def add(
+        self,
+        hit: SearchHit,
+        tokens: Iterable[str],
+        name_tokens: Iterable[str]
+    ):
+        self.remove(hit.object_id)
+        tokens = tuple(sorted(set(tokens)))
+        self.documents[hit.object_id] = (hit, tokens, tuple(name_tokens))
+        for token in tokens:
+            posting = self.postings.get(token)
+            if posting is None:
+                posting = self.postings[token] = set()
+                bisect.insort(self.vocabulary, token)
+            posting.add(hit.object_id)
+
+    def remove(
+        self,
+        object_id: int
+    ) -> bool:
+        document = self.documents.pop(object_id, None)
+        if document is None:
+            return False
+        for token in document[1]:
+            posting = self.postings[token]
+            posting.discard(object_id)
+            if not posting:
+                del self.postings[token]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, token)]
+        return True
+
+    def matching(
+        self,
+        prefix: str
+    ) -> Set[int]:
+        vocabulary = self.vocabulary
+        position = bisect.bisect_left(vocabulary, prefix)
+        end = bisect.bisect_left(vocabulary, prefix + "\U0010ffff", position)
+        if end - position == 1:
+            return self.postings[vocabulary[position]]
+        matches: Set[int] = set()
+        for token in vocabulary[position:end]:
+            matches.update(self.postings[token])
+        return matches
+
+    def search(
+        self,
+        query: str,
+        limit: int,
+        game_mode: Optional[int] = None,
+        max_version: Optional[int] = None
+    ) -> List[SearchHit]:
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        candidates: Optional[Set[int]] = None
+        for term in sorted(set(terms), key=len, reverse=True):
+            matches = self.matching(term)
+            candidates = set(matches) if candidates is None else candidates & matches
+            if not candidates:
+                return []
+
+        ranked = []
+        for object_id in candidates:
+            hit, _, name_tokens = self.documents[object_id]
+            if game_mode is not None and hit.game_mode_group != game_mode:
+                continue
+            if max_version is not None and (hit.game_version or 0) > max_version:
+                continue
+            # Hits whose name matches every term come before hits that only match the description.
+            in_name = all(any(token.startswith(term) for token in name_tokens) for term in terms)
+            ranked.append((not in_name, -hit.score, object_id, hit))
+        ranked.sort(key=lambda item: item[:3])
+        return [item[3] for item in ranked[:limit]]
+
+class SearchIndex(Sink):
+    """A local inverted index answering map and user searches without requests.
+
+    ``name``, ``desc`` and ``author_name`` of maps and ``name`` of users are tokenized into lowercase words.
+    Every query word matches as a prefix, so ``"roun jun"`` finds "Roundabout Junction".
+    Hits whose name matches come first, then they are ranked by votes and favorites for maps and by followers for users.
+
+    Objects can be added at any time, adding a known ID replaces its entry.
+    As a :class:`.Sink` the index can be fed by a :class:`.CatalogSync` directly.
+    """
+
+    def __init__(self):
+        self._maps = _Corpus()
+        self._users = _Corpus()
+
+    def __len__(self) -> int:
+        return len(self._maps.documents) + len(self._users.documents)
+
+    def add(
+        self,
+        obj: Union[Map, User]
+    ):
+        """Index a :class:`.Map` or :class:`.User`, replacing an older entry with the same ID."""
+        if isinstance(obj, Map):
+            name = getattr(obj, "name", None) or ""
+            author_name = getattr(obj, "author_name", None)
+            score = (getattr(obj, "votes_up", 0) or 0) - (getattr(obj, "votes_down", 0) or 0) + (getattr(obj, "favorites", 0) or 0)
+            hit = SearchHit("map", obj.object_id, name, author_name, getattr(obj, "game_mode_group", None), getattr(obj, "game_version", 0), score)
+            name_tokens = tokenize(name) + tokenize(author_name)
+            self._maps.add(hit, name_tokens + tokenize(getattr(obj, "desc", None)), name_tokens)
+        elif isinstance(obj, User):
+            name = getattr(obj, "name", None) or ""
+            hit = SearchHit("user", obj.object_id, name, None, None, getattr(obj, "game_version", 0), getattr(obj, "followers", 0) or 0)
+            name_tokens = tokenize(name)
+            self._users.add(hit, name_tokens, name_tokens)
+        else:
+            raise TypeError(f"can't index {type(obj).__name__!r} objects")
+
+    def add_many(
+        self,
+        objects: Iterable[Union[Map, User]]
+    ):
+        """Index many objects, see :meth:`add`."""
+        for obj in objects:
+            if obj is not None:
+                self.add(obj)
+
+    def remove(
+        self,
+        kind: Kind,
+        object_id: int
+    ) -> bool:
+        """Drop an entry, return whether it existed."""
+        return (self._maps if kind == "map" else self._users).remove(object_id)
+
+    def write(
+        self,
+        maps: List[Map]
+    ):
+        self.add_many(maps)
+
+    def delete(
+        self,
+        map_ids: List[int]
+    ):
+        for map_id in map_ids:
+            self._maps.remove(map_id)
+
+    def search_maps(
+        self,
+        query: str,
+        game_mode: Optional[Literal[1, 2, 3]] = None,
+        max_version: Optional[int] = None,
+        limit: int = 20
+    ) -> List[SearchHit]:
+        """Find maps whose name, description or author name match every word of ``query``.
+
+        :param query: Words, each matched as a prefix.
+        :param game_mode: Only return maps of this game mode.
+        :param max_version: Only return maps made with this game version or older.
+        :param limit: Maximum amount of hits.
+        """
+        return self._maps.search(query, limit, game_mode, max_version)
+
+    def search_users(
+        self,
+        query: str,
+        limit: int = 20
+    ) -> List[SearchHit]:
+        """Find users whose name matches every word of ``query``, see :meth:`search_maps`."""
+        return self._users.search(query, limit)
+
+    def save(
+        self,
+        path: str
+    ):
+        """Write the index to a compressed file.
+
+        Tokens are stored once in a shared vocabulary and referenced by number, descriptions themselves are not kept.
+        """
+        vocabulary: Dict[str, int] = {}
+
+        def numbers(tokens: Iterable[str]) -> List[int]:
+            return [vocabulary.setdefault(token, len(vocabulary)) for token in tokens]
+
+        maps = [
+            [hit.object_id, hit.name, hit.author_name, hit.game_mode_group, hit.game_version, hit.score, numbers(tokens), numbers(name_tokens)]
+            for hit, tokens, name_tokens in self._maps.documents.values()
+        ]
+        users = [
+            [hit.object_id, hit.name, hit.game_version, hit.score, numbers(tokens)]
+            for hit, tokens, _ in self._users.documents.values()
+        ]
+        state = {"version": 1, "vocabulary": list(vocabulary), "maps": maps, "users": users}
+
+        write_atomically(path, zlib.compress(json.dumps(state, separators=(",", ":")).encode(), 6))
+
+    @classmethod
+    def load(
+        cls,
+        path: str
+    ) -> "SearchIndex":
+        """Read an index written by :meth:`save`."""
+        with open(path, "rb") as file:
+            state: Dict[str, Any] = json.loads(zlib.decompress(file.read()))
+        if state.get("version") != 1:
+            raise ValueError(f"unsupported search index version {state.get('version')!r}")
+
+        index = cls()
+        vocabulary = state["vocabulary"]
+        for object_id, name, author_name, game_mode_group, game_version, score, tokens, name_tokens in state["maps"]:
+            hit = SearchHit("map", object_id, name, author_name, game_mode_group, game_version, score)
+            index._maps.add(hit, [vocabulary[token] for token in tokens], [vocabulary[token] for token in name_tokens])
+        for object_id, name, game_version, score, tokens in state["users"]:
+            hit = SearchHit("user", object_id, name, None, None, game_version, score)
+            words = [vocabulary[token] for token in tokens]
+            index._users.add(hit, words, words)
+        return index
\ No newline at end of file
@@ -0,0 +1,232 @@
+from typing import TYPE_CHECKING, Optional, Dict, List, Tuple, Type, Iterable, Any, Union
+
+import json
+import operator
+import struct
+import zlib
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+from tl3api.base import ICObjectBase
+from tl3api.comment import Comment
+from tl3api.export import schema_for
+from tl3api.high_score import HighScore
+from tl3api.map import Map
+from tl3api.user import User
+
+if TYPE_CHECKING:
+    from tl3api.wrapper import Client
+
+MODELS: Dict[int, Type[ICObjectBase]] = {1: Map, 2: User, 3: Comment, 4: HighScore}
+"""Model class of every type tag. Tags are part of the encoding and never reused."""
+
+_STRUCT = 1
+_MSGPACK = 2
+_JSON = 3
+
+_HAS_EXTRA = 1
+
+_HEADER = struct.Struct("<BBBII")
+"""Variant, type tag, flags, presence mask and schema fingerprint."""
+_LENGTH = struct.Struct("<I")
+_TYPES = {"int": int, "bool": bool, "str": str}
+_CODES = {"int": "q", "bool": "?", "str": "I"}
+
+class _Layout:
+    """How the fields present in one presence mask are packed.
+
+    The struct holds ints, bools and the length of every string in characters, followed by the byte size of the UTF-8 text that holds all strings.
+    """
+    __slots__ = ("fields", "names", "types", "strings", "get")
+
+    def __init__(
+        self,
+        names: Tuple[str, ...],
+        kinds: Tuple[str, ...]
+    ):
+        self.fields = struct.Struct("<" + "".join(_CODES[kind] for kind in kinds) + "I")
+        self.names = names
+        self.types = tuple(_TYPES[kind] for kind in kinds)
+        self.strings = tuple(position for position, kind in enumerate(kinds) if kind == "str")
+        self.get = operator.attrgetter(*names) if len(names) > 1 else lambda obj: (getattr(obj, names[0]),) if names else ()
+
+    def set(
+        self,
+        obj: ICObjectBase,
+        values: Iterable[Any]
+    ):
+        for name, value in zip(self.names, values):
+            setattr(obj, name, value)
+
+class _Codec:
+    """Field order of one model and its :class:`._Layout` per presence mask."""
+
+    def __init__(
+        self,
+        tag: int,
+        model: Type[ICObjectBase]
+    ):
+        self.tag = tag
+        self.model = model
+        schema = schema_for(model)
+        self.names: Tuple[str, ...] = tuple(schema)
+        self.kinds: Tuple[str, ...] = tuple(schema.values())
+        self.full = (1 << len(self.names)) - 1
+        # Masks and packed values follow the field order, so blobs of another field list must not be decoded.
+        self.fingerprint = zlib.crc32(",".join(f"{name}:{kind}" for name, kind in schema.items()).encode())
+        self._layouts: Dict[int, _Layout] = {}
+        self.layout(self.full)
+
+    def layout(self, mask: int) -> _Layout:
+        layout = self._layouts.get(mask)
+        if layout is None:
+            present = [index for index in range(len(self.names)) if mask >> index & 1]
+            layout = self._layouts[mask] = _Layout(tuple(self.names[index] for index in present), tuple(self.kinds[index] for index in present))
+        return layout
+
+    def values(self, obj: ICObjectBase) -> Tuple[int, _Layout, Tuple[Any, ...]]:
+        layout = self._layouts[self.full]
+        try:
+            return self.full, layout, layout.get(obj)
+        except AttributeError:
+            pass
+        # Some fields weren't returned by the API.
+        mask = 0
+        for index, name in enumerate(self.names):
+            if hasattr(obj, name):
+                mask |= 1 << index
+        layout = self.layout(mask)
+        return mask, layout, layout.get(obj)
+
+_CODECS: Dict[Type[ICObjectBase], _Codec] = {model: _Codec(tag, model) for tag, model in MODELS.items()}
+_BY_TAG: Dict[int, _Codec] = {codec.tag: codec for codec in _CODECS.values()}
+
+def to_bytes(obj: ICObjectBase) -> bytes:
+    """Encode a :class:`.Map`, :class:`.User`, :class:`.Comment` or :class:`.HighScore` without its :class:`.Client`.
+
+    Fields are packed with :mod:`msgpack` when it is installed and with :mod:`struct` otherwise, objects with fields of an unexpected type, e.g. ``None``, or strings that aren't valid UTF-8, e.g. lone surrogates, fall back to JSON.
+    :func:`from_bytes` reads every variant, whichever is installed.
+    The header holds a fingerprint of the model's fields, decoding raises :exc:`ValueError` after fields were added, removed or reordered.
+    """
+    codec = _CODECS.get(type(obj))
+    if codec is None:
+        raise TypeError(f"can't serialize {type(obj).__name__!r} objects")
+    extra = obj._extra
+    flags = _HAS_EXTRA if extra else 0
+    mask, layout, values = codec.values(obj)
+
+    if tuple(map(type, values)) == layout.types:
+        if msgpack is not None:
+            try:
+                body = msgpack.packb([values, extra] if extra else values)
+            except (OverflowError, TypeError, UnicodeEncodeError):
+                pass
+            else:
+                return _HEADER.pack(_MSGPACK, codec.tag, flags, mask, codec.fingerprint) + body
+
+        packed = list(values)
+        strings = [values[position] for position in layout.strings]
+        for position in layout.strings:
+            packed[position] = len(packed[position])
+        try:
+            text = "".join(strings).encode()
+            packed.append(len(text))
+            body = layout.fields.pack(*packed) + text
+        except (struct.error, UnicodeEncodeError):
+            pass
+        else:
+            if extra:
+                body += json.dumps(extra, separators=(",", ":")).encode()
+            return _HEADER.pack(_STRUCT, codec.tag, flags, mask, codec.fingerprint) + body
+
+    body = json.dumps([dict(zip(layout.names, values)), extra], separators=(",", ":")).encode()
+    return _HEADER.pack(_JSON, codec.tag, flags, mask, codec.fingerprint) + body
+
+def from_bytes(
+    data: Union[bytes, memoryview],
+    client: Optional["Client"] = None
+) -> ICObjectBase:
+    """Decode an object written by :func:`to_bytes`, without going through the API's camelCase keys.
+
+    :param data: The encoded object.
+    :param client: The :class:`.Client` the object is attached to, see :meth:`.ICObjectBase.attach`.
+    """
+    return _decode(data, 0, len(data), client)
+
+def _decode(
+    data: Union[bytes, memoryview],
+    offset: int,
+    end: int,
+    client: Optional["Client"]
+) -> ICObjectBase:
+    variant, tag, flags, mask, fingerprint = _HEADER.unpack_from(data, offset)
+    offset += _HEADER.size
+    codec = _BY_TAG.get(tag)
+    if codec is None:
+        raise ValueError(f"unknown type tag {tag}")
+    if fingerprint != codec.fingerprint:
+        raise ValueError(f"{codec.model.__name__} was encoded with different fields, it can't be decoded by this version")
+    obj = codec.model.__new__(codec.model)
+    obj._client = client
+    obj._extra = None
+
+    if variant == _STRUCT:
+        layout = codec.layout(mask)
+        values = layout.fields.unpack_from(data, offset)
+        offset += layout.fields.size
+        stop = offset + values[-1]
+        if layout.strings:
+            values = list(values)
+            text = str(data[offset:stop], "utf-8")
+            position = 0
+            for index in layout.strings:
+                length = values[index]
+                values[index] = text[position:position + length]
+                position += length
+        layout.set(obj, values[:-1])
+        if flags & _HAS_EXTRA:
+            obj._extra = json.loads(bytes(data[stop:end]))
+    elif variant == _MSGPACK:
+        if msgpack is None:
+            raise RuntimeError("msgpack is not installed")
+        values = msgpack.unpackb(data[offset:end])
+        if flags & _HAS_EXTRA:
+            values, obj._extra = values
+        codec.layout(mask).set(obj, values)
+    elif variant == _JSON:
+        values, extra = json.loads(bytes(data[offset:end]))
+        for name, value in values.items():
+            setattr(obj, name, value)
+        obj._extra = extra
+    else:
+        raise ValueError(f"unknown encoding {variant}")
+    return obj
+
+def to_bytes_many(objects: Iterable[ICObjectBase]) -> bytes:
+    """Encode many objects into one buffer, each prefixed with its length."""
+    pack = _LENGTH.pack
+    parts: List[bytes] = []
+    for obj in objects:
+        encoded = to_bytes(obj)
+        parts.append(pack(len(encoded)))
+        parts.append(encoded)
+    return b"".join(parts)
+
+def from_bytes_many(
+    data: bytes,
+    client: Optional["Client"] = None
+) -> List[ICObjectBase]:
+    """Decode a buffer written by :func:`to_bytes_many`, see :func:`from_bytes`."""
+    unpack = _LENGTH.unpack_from
+    size = _LENGTH.size
+    objects: List[ICObjectBase] = []
+    offset = 0
+    while offset < len(data):
+        (length,) = unpack(data, offset)
+        offset += size
+        objects.append(_decode(data, offset, offset + length, client))
+        offset += length
+    return objects
\ No newline at end of file
@@ -0,0 +1,77 @@
+from typing import Optional
+
+import aiohttp
+
+BASE_URL = "https://tl3.shadowtree-software.se/TL3BackEnd/rest"
+"""Root of the official Intersection Controller API."""
+
+class PoolOptions:
+    """Connection pool settings for the aiohttp session a :class:`.Client` creates itself.
+
+    =================================== ================================================
+    Attribute                           Description
+    =================================== ================================================
+    limit                               Maximum amount of open connections, 0 for no
+                                        limit.
+    limit_per_host                      Maximum amount of open connections per host, 0
+                                        for no limit.
+    keepalive_timeout                   Seconds an idle connection is kept open.
+    ttl_dns_cache                       Seconds resolved addresses are cached, ``None``
+                                        to cache forever.
+    total_timeout                       Seconds a whole request may take.
+    connect_timeout                     Seconds to wait for a free connection and to
+                                        connect.
+    read_timeout                        Seconds to wait between two reads of a response.
+    compress                            Whether to ask for compressed responses.
+    verify_ssl                          Whether to verify the server's certificate.
+    """
+    __slots__ = (
+        "limit", "limit_per_host", "keepalive_timeout", "ttl_dns_cache", "total_timeout", "connect_timeout", 
+        "read_timeout", "compress", "verify_ssl"
+    )
+
+    def __init__(
+        self, 
+        limit: int = 100, 
+        limit_per_host: int = 0, 
+        keepalive_timeout: float = 30.0, 
+        ttl_dns_cache: Optional[int] = 300, 
+        total_timeout: Optional[float] = 60.0, 
+        connect_timeout: Optional[float] = 10.0, 
+        read_timeout: Optional[float] = 30.0, 
+        compress: bool = True, 
+        verify_ssl: bool = False
+    ):
+        """Initialize a :class:`.PoolOptions` instance, see the class documentation for the parameters."""
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.ttl_dns_cache = ttl_dns_cache
+        self.total_timeout = total_timeout
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.compress = compress
+        self.verify_ssl = verify_ssl
+
+    def create_session(self) -> aiohttp.ClientSession:
+        """Create an aiohttp :class:`ClientSession` with these settings. Must be called from a running event loop."""
+        connector = aiohttp.TCPConnector(
+            limit=self.limit, 
+            limit_per_host=self.limit_per_host, 
+            keepalive_timeout=self.keepalive_timeout, 
+            ttl_dns_cache=self.ttl_dns_cache, 
+            use_dns_cache=True, 
+            ssl=self.verify_ssl
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=self.total_timeout, 
+            connect=self.connect_timeout, 
+            sock_read=self.read_timeout
+        )
+        headers = {"Accept-Encoding": "gzip, deflate" if self.compress else "identity"}
+        return aiohttp.ClientSession(
+            connector=connector, 
+            timeout=timeout, 
+            headers=headers, 
+            auto_decompress=self.compress
+        )
\ No newline at end of file
@@ -0,0 +1,217 @@
+from typing import Optional, Dict, Tuple, List, FrozenSet
+
+import os
+import sqlite3
+import threading
+import time
+
+STORED_ENDPOINTS: FrozenSet[str] = frozenset({"user", "map", "comments", "high_scores"})
+"""Endpoints whose responses are written to a :class:`.PayloadStore` by default."""
+
+DEFAULT_MAX_AGES: Dict[str, float] = {
+    "user": 7 * 86400,
+    "map": 86400,
+    "comments": 3600,
+    "high_scores": 3600,
+}
+"""Seconds a stored response stays valid for each endpoint unless overridden."""
+
+class PayloadStore:
+    """Superclass for persistent stores of raw response bodies.
+
+    A :class:`.Client` reads through a store before going to the network and writes every fresh response back to it.
+    Subclasses implement :meth:`get` and :meth:`put`.
+
+    Methods may block on disk, the :class:`.Client` calls them with :func:`asyncio.to_thread` so they must be thread-safe.
+    """
+    endpoints: FrozenSet[str] = STORED_ENDPOINTS
+    """Endpoints this store keeps responses for."""
+
+    def get(
+        self,
+        endpoint: str,
+        key: str
+    ) -> Optional[bytes]:
+        """Return a stored response body, or ``None`` if it is missing or expired.
+
+        :param endpoint: Name of the endpoint the response came from.
+        :param key: The request URL.
+        """
+        raise NotImplementedError
+
+    def put(
+        self,
+        endpoint: str,
+        key: str,
+        object_id: Optional[int],
+        body: bytes
+    ):
+        """Store a response body.
+
+        :param endpoint: Name of the endpoint the response came from.
+        :param key: The request URL.
+        :param object_id: ID of the object the response describes.
+        :param body: The raw response body.
+        """
+        raise NotImplementedError
+
+    def flush(self):
+        """Persist pending writes."""
+
+    def close(self):
+        """Persist pending writes and release resources."""
+        self.flush()
+
+class SQLiteStore(PayloadStore):
+    """A :class:`.PayloadStore` backed by a SQLite database.
+
+    The database is only opened on first use and rows are read on demand, so constructing a store is free.
+    Writes are buffered and committed in batches of ``batch_size``.
+    Every method blocks on SQLite, call them from a thread when using the store directly from async code.
+    A closed store reopens the database on next use.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_ages: Optional[Dict[str, float]] = None,
+        default_max_age: float = 3600,
+        batch_size: int = 100,
+        endpoints: Optional[FrozenSet[str]] = None
+    ):
+        """Initialize a :class:`.SQLiteStore` instance.
+
+        :param path: Path of the database file, created if it doesn't exist.
+        :param max_ages: Per-endpoint max-age overrides in seconds, merged over :data:`.DEFAULT_MAX_AGES`.
+        :param default_max_age: Max-age for endpoints without their own.
+        :param batch_size: Amount of buffered writes that triggers a commit.
+        :param endpoints: Endpoints to keep responses for, defaults to :data:`.STORED_ENDPOINTS`.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1")
+
+        self.path = path
+        self.max_ages = dict(DEFAULT_MAX_AGES)
+        if max_ages:
+            self.max_ages.update(max_ages)
+        self.default_max_age = default_max_age
+        self.batch_size = batch_size
+        if endpoints is not None:
+            self.endpoints = frozenset(endpoints)
+
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pending: Dict[str, Tuple[str, str, Optional[int], float, float, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS payloads ("
+                "key TEXT PRIMARY KEY, "
+                "endpoint TEXT NOT NULL, "
+                "object_id INTEGER, "
+                "fetched_at REAL NOT NULL, "
+                "max_age REAL NOT NULL, "
+                "body BLOB NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS payloads_object ON payloads (endpoint, object_id)")
+            connection.execute("CREATE INDEX IF NOT EXISTS payloads_fetched ON payloads (fetched_at)")
+            connection.commit()
+            self._connection = connection
+
+        return self._connection
+
+    def max_age_for(self, endpoint: str) -> float:
+        """Return the max-age of an endpoint's responses in seconds."""
+        return self.max_ages.get(endpoint, self.default_max_age)
+
+    def get(
+        self,
+        endpoint: str,
+        key: str
+    ) -> Optional[bytes]:
+        with self._lock:
+            row = self._pending.get(key)
+            if row is not None:
+                return row[5]
+
+            found = self._connect().execute(
+                "SELECT fetched_at, max_age, body FROM payloads WHERE key = ?", (key,)
+            ).fetchone()
+
+        if found is None:
+            return None
+
+        fetched_at, max_age, body = found
+        if time.time() - fetched_at > max_age:
+            return None
+        return bytes(body)
+
+    def put(
+        self,
+        endpoint: str,
+        key: str,
+        object_id: Optional[int],
+        body: bytes
+    ):
+        with self._lock:
+            self._pending[key] = (key, endpoint, object_id, time.time(), self.max_age_for(endpoint), body)
+            full = len(self._pending) >= self.batch_size
+
+        if full:
+            self.flush()
+
+    def get_by_object_id(
+        self,
+        endpoint: str,
+        object_id: int
+    ) -> List[bytes]:
+        """Return every unexpired response body stored for an object, newest first.
+
+        :param endpoint: Name of the endpoint the responses came from.
+        :param object_id: ID of the object.
+        """
+        self.flush()
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT body FROM payloads WHERE endpoint = ? AND object_id = ? AND fetched_at + max_age >= ? ORDER BY fetched_at DESC",
+                (endpoint, object_id, time.time())
+            ).fetchall()
+        return [bytes(row[0]) for row in rows]
+
+    def flush(self):
+        with self._lock:
+            if not self._pending:
+                return
+            rows = list(self._pending.values())
+            self._pending.clear()
+
+            connection = self._connect()
+            connection.executemany("INSERT OR REPLACE INTO payloads VALUES (?, ?, ?, ?, ?, ?)", rows)
+            connection.commit()
+
+    def purge_expired(self) -> int:
+        """Delete expired responses.
+
+        :return: Amount of deleted responses.
+        """
+        self.flush()
+        with self._lock:
+            connection = self._connect()
+            deleted = connection.execute("DELETE FROM payloads WHERE fetched_at + max_age < ?", (time.time(),)).rowcount
+            connection.commit()
+        return deleted
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
@@ -0,0 +1,133 @@
+from typing import Any, List, AsyncIterator, AsyncIterable
+
+import codecs
+import json
+
+_WHITESPACE = " \t\n\r"
+_CLOSING = '}]",'
+
+class ArrayParser:
+    """Incrementally parses a JSON array fed in chunks and returns its elements as soon as they are complete.
+
+    Only the unparsed rest of the input is buffered, so memory stays bounded by the largest element rather than the whole array.
+    Elements are decoded with :meth:`json.JSONDecoder.raw_decode`, since faster decoders can't resume in the middle of a document.
+    A ``null`` body is treated as an empty array.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._position = 0
+        self._started = False
+        self._finished = False
+        # What may come next: "first" (an element or "]"), "element" (after a comma) or "separator" ("," or "]").
+        self._expect = "first"
+        # Don't retry an incomplete element before a chunk could have closed it.
+        self._retry = False
+
+    @property
+    def finished(self) -> bool:
+        """Whether the closing bracket was reached."""
+        return self._finished
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Add a chunk of the body and return the elements it completed."""
+        text = self._text.decode(chunk)
+        self._buffer += text
+        if self._finished:
+            return []
+        if any(char in text for char in _CLOSING):
+            self._retry = True
+        return self._parse(final=False)
+
+    def close(self) -> List[Any]:
+        """Signal the end of the body and return the remaining elements.
+
+        :raises ValueError: If the body isn't a complete JSON array.
+        """
+        self._buffer += self._text.decode(b"", final=True)
+        self._retry = True
+        elements = self._parse(final=True)
+        rest = self._buffer[self._position:].strip(_WHITESPACE)
+        if not self._finished:
+            if rest == "null" and not self._started:
+                self._finished = True
+                return elements
+            raise ValueError("incomplete JSON array")
+        if rest:
+            raise ValueError("unexpected data after the end of the JSON array")
+        return elements
+
+    def _skip(self) -> int:
+        buffer, position = self._buffer, self._position
+        while position < len(buffer) and buffer[position] in _WHITESPACE:
+            position += 1
+        return position
+
+    def _parse(self, final: bool) -> List[Any]:
+        elements: List[Any] = []
+        buffer = self._buffer
+
+        if not self._started:
+            position = self._skip()
+            if position == len(buffer):
+                return elements
+            if buffer[position] != "[":
+                if buffer[position] == "n":
+                    return elements
+                raise ValueError("expected a JSON array")
+            self._position = position + 1
+            self._started = True
+            self._retry = True
+
+        while self._retry and not self._finished:
+            position = self._skip()
+            if position == len(buffer):
+                break
+            char = buffer[position]
+            if self._expect == "separator":
+                if char == ",":
+                    self._position = position + 1
+                    self._expect = "element"
+                    continue
+                if char != "]":
+                    raise ValueError(f"expected ',' or ']' in JSON array, got {char!r}")
+            elif char in ",]" and (char == "," or self._expect == "element"):
+                raise ValueError(f"expected an element in JSON array, got {char!r}")
+            if char == "]":
+                self._position = position + 1
+                self._finished = True
+                break
+
+            try:
+                element, end = self._decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if final:
+                    raise ValueError("incomplete or malformed JSON array") from None
+                self._retry = False
+                break
+            if not final and not isinstance(element, (dict, list, str)):
+                # A number might continue in the next chunk, only trust it once a delimiter follows.
+                following = buffer[end:].lstrip(_WHITESPACE)[:1]
+                if following not in (",", "]"):
+                    self._retry = False
+                    break
+            elements.append(element)
+            self._position = end
+            self._expect = "separator"
+
+        # Drop the consumed prefix so the buffer only holds the element in progress.
+        if self._position > 65536 and self._position * 2 > len(buffer):
+            self._buffer = buffer[self._position:]
+            self._position = 0
+        return elements
+
+async def iter_array(chunks: AsyncIterable[bytes]) -> AsyncIterator[Any]:
+    """Yield the elements of a JSON array whose body arrives as ``chunks``, each as soon as it is complete."""
+    parser = ArrayParser()
+    async for chunk in chunks:
+        for element in parser.feed(chunk):
+            yield element
+    for element in parser.close():
+        yield element
\ No newline at end of file
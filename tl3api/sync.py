@@ -0,0 +1,248 @@
+from typing import TYPE_CHECKING, Optional, Dict, List, Tuple, Iterable, Any, Literal
+
+import asyncio
+import json
+import os
+import time
+
+from tl3api.files import write_json
+from tl3api.map import Map
+
+if TYPE_CHECKING:
+    from tl3api.wrapper import Client
+
+GameMode = Literal[1, 2, 3]
+Watermark = Tuple[int, int]
+
+class Sink:
+    """Superclass for destinations of a :class:`.CatalogSync`.
+
+    Writes are upserts keyed by ``object_id``, a map can be written more than once, e.g. after a resumed run or a recheck.
+    Subclasses implement :meth:`write`.
+    """
+
+    def write(
+        self,
+        maps: List[Map]
+    ):
+        """Insert or replace maps."""
+        raise NotImplementedError
+
+    def delete(
+        self,
+        map_ids: List[int]
+    ):
+        """Remove maps that disappeared from the API."""
+
+    def flush(self):
+        """Persist pending writes, called before every checkpoint."""
+
+    def close(self):
+        """Persist pending writes and release resources."""
+
+class MemorySink(Sink):
+    """A :class:`.Sink` keeping the maps in a :class:`dict` by ID."""
+
+    def __init__(self):
+        self.maps: Dict[int, Map] = {}
+
+    def write(
+        self,
+        maps: List[Map]
+    ):
+        for _map in maps:
+            self.maps[_map.object_id] = _map
+
+    def delete(
+        self,
+        map_ids: List[int]
+    ):
+        for map_id in map_ids:
+            self.maps.pop(map_id, None)
+
+class CatalogSync:
+    """Mirrors the map catalog of every game mode into a :class:`.Sink`.
+
+    Each game mode keeps a watermark, the ``(created, object_id)`` of the newest map already synced.
+    :meth:`run` walks :meth:`.Client.list_new_maps` from the newest page down until it reaches the watermark, so only the first run walks the whole catalog.
+    Maps updated within ``recheck_window`` are fetched again with :meth:`.Client.get_map_details` once every ``recheck_interval``.
+
+    Progress is written to a JSON checkpoint after every page, a killed run resumes with the page it stopped at.
+    """
+
+    def __init__(
+        self,
+        client: "Client",
+        sink: Sink,
+        checkpoint: Optional[str] = None,
+        game_modes: Iterable[GameMode] = (1, 2, 3),
+        page_size: int = 100,
+        max_version: int = 999,
+        recheck_window: float = 7 * 86400,
+        recheck_interval: float = 86400,
+        concurrency: int = 10
+    ):
+        """Initialize a :class:`.CatalogSync` instance.
+
+        :param client: The :class:`.Client` making the requests.
+        :param sink: Where synced maps are written.
+        :param checkpoint: Path of the JSON checkpoint file, progress is only kept in memory if omitted.
+        :param game_modes: Game modes to mirror.
+        :param page_size: Maps requested per page.
+        :param max_version: Game version passed to the API.
+        :param recheck_window: Seconds since its last update during which a map is rechecked.
+        :param recheck_interval: Seconds between two rechecks of the same map.
+        :param concurrency: Maximum amount of simultaneous recheck requests.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+
+        self.client = client
+        self.sink = sink
+        self.checkpoint = checkpoint
+        self.game_modes = tuple(game_modes)
+        self.page_size = page_size
+        self.max_version = max_version
+        self.recheck_window = recheck_window
+        self.recheck_interval = recheck_interval
+        self.concurrency = concurrency
+        self._state = self._load_state()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def watermark(
+        self,
+        game_mode: GameMode
+    ) -> Optional[Watermark]:
+        """The ``(created, object_id)`` of the newest map synced for a game mode, ``None`` before the first complete walk."""
+        watermark = self._mode(game_mode)["watermark"]
+        return tuple(watermark) if watermark is not None else None
+
+    async def run(self) -> Dict[str, int]:
+        """Sync new maps of every game mode, then recheck recently updated maps.
+
+        :return: Amount of ``new`` maps, ``pages`` fetched, ``rechecked`` maps, ``deleted`` maps and maps whose recheck ``failed``.
+        """
+        self._lock = asyncio.Lock()
+        counts = await asyncio.gather(*(self.sync_new(game_mode) for game_mode in self.game_modes))
+        stats = {"new": sum(new for new, _ in counts), "pages": sum(pages for _, pages in counts)}
+        stats.update(await self.recheck())
+        return stats
+
+    async def sync_new(
+        self,
+        game_mode: GameMode
+    ) -> Tuple[int, int]:
+        """Walk new maps of one game mode down to its watermark.
+
+        :return: The amount of new maps and of pages fetched.
+        """
+        state = self._mode(game_mode)
+        watermark = tuple(state["watermark"]) if state["watermark"] is not None else None
+        new = pages = 0
+
+        while True:
+            maps = await self.client.list_new_maps(game_mode, self.page_size, state["page"], self.max_version, cache_mode="bypass")
+            pages += 1
+
+            fresh = []
+            reached = len(maps) < self.page_size
+            for _map in maps:
+                key = (_map.created, _map.object_id)
+                if watermark is not None and key <= watermark:
+                    reached = True
+                    break
+                fresh.append(_map)
+                if state["newest"] is None or key > tuple(state["newest"]):
+                    state["newest"] = list(key)
+
+            if fresh:
+                self.sink.write(fresh)
+                self._track(fresh)
+                new += len(fresh)
+
+            if reached:
+                if state["newest"] is not None:
+                    state["watermark"] = state["newest"]
+                state["page"] = 0
+                state["newest"] = None
+            else:
+                state["page"] += 1
+            await self._save()
+
+            if reached:
+                return new, pages
+
+    async def recheck(self) -> Dict[str, int]:
+        """Fetch recently updated maps that are due again and write them to the sink.
+
+        Maps whose last update left the ``recheck_window`` are no longer tracked.
+
+        :return: Amount of ``rechecked``, ``deleted`` and ``failed`` maps. Failed maps stay due and are fetched again by the next recheck.
+        """
+        now = time.time()
+        tracked: Dict[str, List[float]] = self._state["recheck"]
+        horizon = (now - self.recheck_window) * 1000
+        for map_id in [map_id for map_id, (updated, _) in tracked.items() if updated < horizon]:
+            del tracked[map_id]
+
+        due = [int(map_id) for map_id, (_, checked) in tracked.items() if now - checked >= self.recheck_interval]
+        if not due:
+            return {"rechecked": 0, "deleted": 0, "failed": 0}
+
+        results = await self.client.get_map_details_many(due, self.concurrency, cache_mode="refresh")
+        found: List[Map] = []
+        gone: List[int] = []
+        failed = 0
+        for map_id, result in results.items():
+            if isinstance(result, BaseException):
+                failed += 1
+                continue
+            if result is None:
+                gone.append(map_id)
+                del tracked[str(map_id)]
+            else:
+                found.append(result)
+                tracked[str(map_id)] = [result.updated, now]
+
+        if found:
+            self.sink.write(found)
+        if gone:
+            self.sink.delete(gone)
+        await self._save()
+        return {"rechecked": len(found), "deleted": len(gone), "failed": failed}
+
+    def _track(
+        self,
+        maps: List[Map]
+    ):
+        now = time.time()
+        horizon = (now - self.recheck_window) * 1000
+        tracked = self._state["recheck"]
+        for _map in maps:
+            updated = getattr(_map, "updated", None) or getattr(_map, "created", 0)
+            if updated >= horizon:
+                tracked[str(_map.object_id)] = [updated, now]
+
+    def _mode(
+        self,
+        game_mode: GameMode
+    ) -> Dict[str, Any]:
+        return self._state["modes"].setdefault(str(game_mode), {"watermark": None, "page": 0, "newest": None})
+
+    def _load_state(self) -> Dict[str, Any]:
+        if self.checkpoint is not None and os.path.exists(self.checkpoint):
+            with open(self.checkpoint, "r", encoding="utf-8") as file:
+                state = json.load(file)
+            if state.get("version") == 1:
+                return state
+        return {"version": 1, "modes": {}, "recheck": {}}
+
+    async def _save(self):
+        # Concurrent game modes share the sink and the checkpoint file.
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            self.sink.flush()
+            if self.checkpoint is None:
+                return
+            write_json(self.checkpoint, self._state)
\ No newline at end of file
@@ -0,0 +1,407 @@
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Sequence, Iterator, Union, Callable, Type, Literal
+
+import array
+import functools
+import heapq
+import operator
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from tl3api.base import ICObjectBase
+from tl3api.map import Map
+from tl3api.high_score import HighScore
+
+if TYPE_CHECKING:
+    from tl3api.wrapper import Client
+
+Aggregate = Literal["sum", "mean", "min", "max", "count"]
+
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+_DEFAULTS = {"int": 0, "bool": False, "str": ""}
+
+@functools.lru_cache(maxsize=256)
+def _api_key(name: str) -> str:
+    """Convert a snake_case column name back to the camelCase key the API uses, the inverse of :func:`.convert_key`."""
+    head, *words = name.split("_")
+    return head + "".join(word.capitalize() for word in words)
+
+class ColumnTable:
+    """Superclass for array-backed, column oriented collections of Intersection Controller objects.
+
+    Integer and boolean columns are NumPy arrays when NumPy is installed and :class:`array.array`\\s otherwise, text columns are lists.
+    Missing or ``null`` values are stored as ``0``, ``False`` or ``""``.
+    Operations return new tables and never copy more than the selected rows.
+    """
+    model: Type[ICObjectBase] = ICObjectBase
+    """The class of the objects stored in the table."""
+    schema: Dict[str, Literal["int", "bool", "str"]] = {}
+    """Column names and kinds."""
+
+    def __init__(
+        self,
+        client: Optional["Client"],
+        columns: Dict[str, Sequence[Any]],
+        use_numpy: Optional[bool] = None
+    ):
+        """Initialize a :class:`.ColumnTable` instance.
+
+        :param client: The :class:`.Client` materialized objects are bound to.
+        :param columns: A sequence of values for every column in :attr:`schema`.
+        :param use_numpy: Force the NumPy (``True``) or :mod:`array` (``False``) backend, NumPy is used when installed if omitted.
+        """
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        elif use_numpy and numpy is None:
+            raise RuntimeError("NumPy is not installed")
+
+        self._client = client
+        self._numpy = use_numpy
+        self._columns = {name: self._column(kind, columns[name]) for name, kind in self.schema.items()}
+        lengths = {len(column) for column in self._columns.values()}
+        if len(lengths) > 1:
+            raise ValueError("columns must all have the same length")
+        self._length = lengths.pop() if lengths else 0
+
+    @classmethod
+    def from_payload(
+        cls,
+        client: Optional["Client"],
+        payload: List[Dict[str, Any]],
+        use_numpy: Optional[bool] = None
+    ) -> "ColumnTable":
+        """Build a table straight from a decoded API response, without creating any objects.
+
+        :param client: The :class:`.Client` materialized objects are bound to.
+        :param payload: A list of camelCase dicts as returned by the API.
+        :param use_numpy: See :class:`.ColumnTable`.
+        """
+        columns = {}
+        for name, kind in cls.schema.items():
+            key = _api_key(name)
+            default = _DEFAULTS[kind]
+            values = [item.get(key) for item in payload]
+            columns[name] = [default if value is None else value for value in values]
+        return cls(client, columns, use_numpy)
+
+    @classmethod
+    def from_objects(
+        cls,
+        objects: Sequence[ICObjectBase],
+        client: Optional["Client"] = None,
+        use_numpy: Optional[bool] = None
+    ) -> "ColumnTable":
+        """Build a table from already constructed objects.
+
+        :param objects: Objects of :attr:`model`'s class.
+        :param client: The :class:`.Client` materialized objects are bound to, defaults to the first object's.
+        :param use_numpy: See :class:`.ColumnTable`.
+        """
+        if client is None and objects:
+            client = objects[0]._client
+        columns = {}
+        for name, kind in cls.schema.items():
+            default = _DEFAULTS[kind]
+            columns[name] = [_or_default(getattr(obj, name, None), default) for obj in objects]
+        return cls(client, columns, use_numpy)
+
+    def _column(self, kind: str, values: Sequence[Any]) -> Sequence[Any]:
+        if kind == "str":
+            return values if isinstance(values, list) else list(values)
+        if self._numpy:
+            return numpy.asarray(values, dtype=numpy.bool_ if kind == "bool" else numpy.int64)
+        if isinstance(values, array.array):
+            return values
+        return array.array("b" if kind == "bool" else "q", values)
+
+    def _derive(self, columns: Dict[str, Sequence[Any]]) -> "ColumnTable":
+        table = object.__new__(type(self))
+        table._client = self._client
+        table._numpy = self._numpy
+        table._columns = columns
+        table._length = len(next(iter(columns.values()))) if columns else 0
+        return table
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, name: str) -> Sequence[Any]:
+        return self._columns[name]
+
+    def __iter__(self) -> Iterator[ICObjectBase]:
+        for index in range(self._length):
+            yield self.row(index)
+
+    def __repr__(self) -> str:
+        return f"<{type(self).__name__} rows={self._length} backend={'numpy' if self._numpy else 'array'}>"
+
+    @property
+    def columns(self) -> List[str]:
+        """The table's column names."""
+        return list(self._columns)
+
+    def row(self, index: int) -> ICObjectBase:
+        """Materialize a single row as a :attr:`model` instance.
+
+        :param index: Position of the row.
+        """
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("row index out of range")
+
+        obj = self.model.__new__(self.model)
+        obj._client = self._client
+        obj._extra = None
+        for name, kind in self.schema.items():
+            value = self._columns[name][index]
+            if kind == "bool":
+                value = bool(value)
+            elif kind == "int":
+                value = int(value)
+            setattr(obj, name, value)
+        return obj
+
+    def to_objects(self) -> List[ICObjectBase]:
+        """Materialize every row, see :meth:`row`."""
+        return list(self)
+
+    def take(self, indices: Sequence[int]) -> "ColumnTable":
+        """Return a table with the rows at the given positions, in that order.
+
+        :param indices: Row positions.
+        """
+        columns = {}
+        if self._numpy:
+            indices = numpy.asarray(indices, dtype=numpy.intp)
+            for name, column in self._columns.items():
+                columns[name] = column[indices] if not isinstance(column, list) else [column[i] for i in indices.tolist()]
+        else:
+            for name, column in self._columns.items():
+                taken = [column[i] for i in indices]
+                columns[name] = taken if isinstance(column, list) else array.array(column.typecode, taken)
+        return self._derive(columns)
+
+    def mask(
+        self,
+        column: str,
+        op: Literal["==", "!=", "<", "<=", ">", ">="],
+        value: Any
+    ) -> Sequence[bool]:
+        """Compare a whole column against a value.
+
+        :param column: Name of the column.
+        :param op: Comparison operator.
+        :param value: Value to compare with.
+        :return: One boolean per row, usable with :meth:`filter`.
+        """
+        compare = _OPERATORS[op]
+        values = self._columns[column]
+        if self._numpy and not isinstance(values, list):
+            return compare(values, value)
+        return [compare(v, value) for v in values]
+
+    def filter(
+        self,
+        mask: Sequence[bool]
+    ) -> "ColumnTable":
+        """Return a table with only the rows where ``mask`` is true.
+
+        :param mask: One boolean per row, e.g. from :meth:`mask` or NumPy comparisons.
+        """
+        if len(mask) != self._length:
+            raise ValueError("mask length doesn't match the table")
+        if self._numpy:
+            return self.take(numpy.flatnonzero(numpy.asarray(mask, dtype=numpy.bool_)))
+        return self.take([index for index, keep in enumerate(mask) if keep])
+
+    def where(
+        self,
+        column: str,
+        op: Literal["==", "!=", "<", "<=", ">", ">="],
+        value: Any
+    ) -> "ColumnTable":
+        """Shorthand for ``table.filter(table.mask(column, op, value))``."""
+        return self.filter(self.mask(column, op, value))
+
+    def argsort(
+        self,
+        by: str,
+        descending: bool = False
+    ) -> Sequence[int]:
+        """Return the row positions that sort the table by a column. The sort is stable.
+
+        :param by: Name of the column.
+        :param descending: Sort from the largest value.
+        """
+        values = self._columns[by]
+        if self._numpy and not isinstance(values, list):
+            if descending:
+                # Stable descending order: sort the reversed column and map positions back.
+                return (self._length - 1 - numpy.argsort(values[::-1], kind="stable"))[::-1]
+            return numpy.argsort(values, kind="stable")
+        order = sorted(range(self._length), key=values.__getitem__, reverse=descending)
+        return order
+
+    def sort(
+        self,
+        by: str,
+        descending: bool = False
+    ) -> "ColumnTable":
+        """Return the table sorted by a column, see :meth:`argsort`."""
+        return self.take(self.argsort(by, descending))
+
+    def top_k(
+        self,
+        by: str,
+        k: int,
+        largest: bool = True
+    ) -> "ColumnTable":
+        """Return the ``k`` rows with the largest (or smallest) values of a column, in order.
+
+        Cheaper than sorting the whole table when ``k`` is small.
+
+        :param by: Name of the column.
+        :param k: Amount of rows to return.
+        :param largest: Return the largest values, the smallest otherwise.
+        """
+        k = max(0, min(k, self._length))
+        values = self._columns[by]
+        if self._numpy and not isinstance(values, list):
+            if k == 0:
+                return self.take([])
+            keys = -values.astype(numpy.int64) if largest else values
+            # Ties on the k-th value are resolved by position, like the stable sort.
+            kth = numpy.partition(keys, k - 1)[k - 1]
+            below = numpy.flatnonzero(keys < kth)
+            candidates = numpy.concatenate((below, numpy.flatnonzero(keys == kth)[:k - len(below)]))
+            return self.take(candidates[numpy.argsort(keys[candidates], kind="stable")])
+        select = heapq.nlargest if largest else heapq.nsmallest
+        return self.take(select(k, range(self._length), key=values.__getitem__))
+
+    def group_by(
+        self,
+        key: str,
+        value: Optional[str] = None,
+        aggregate: Aggregate = "count"
+    ) -> Dict[Any, Union[int, float]]:
+        """Aggregate a column per distinct value of another.
+
+        :param key: Column to group on.
+        :param value: Column to aggregate, not needed for ``"count"``.
+        :param aggregate: ``"sum"``, ``"mean"``, ``"min"``, ``"max"`` or ``"count"``.
+        :return: A :class:`dict` from each distinct key to its aggregate, ordered by key.
+        """
+        if aggregate != "count" and value is None:
+            raise ValueError(f"{aggregate!r} needs a value column")
+
+        keys = self._columns[key]
+        if self._numpy and not isinstance(keys, list) and self._length:
+            groups, inverse, counts = numpy.unique(keys, return_inverse=True, return_counts=True)
+            if aggregate == "count":
+                result = counts
+            else:
+                values = numpy.asarray(self._columns[value], dtype=numpy.int64)
+                if aggregate in ("sum", "mean"):
+                    # bincount sums in float64, which loses integers above 2**53.
+                    result = numpy.zeros(len(groups), dtype=numpy.int64)
+                    numpy.add.at(result, inverse, values)
+                    if aggregate == "mean":
+                        result = result / counts
+                else:
+                    order = numpy.argsort(inverse, kind="stable")
+                    starts = numpy.concatenate(([0], numpy.cumsum(counts)[:-1]))
+                    reduce = numpy.minimum if aggregate == "min" else numpy.maximum
+                    result = reduce.reduceat(values[order], starts)
+            return dict(zip(groups.tolist(), result.tolist()))
+
+        accumulated: Dict[Any, List[Any]] = {}
+        values = self._columns[value] if value is not None else keys
+        for group, item in zip(keys, values):
+            accumulated.setdefault(group, []).append(item)
+
+        reducers: Dict[str, Callable[[List[Any]], Union[int, float]]] = {
+            "sum": sum,
+            "mean": lambda items: sum(items) / len(items),
+            "min": min,
+            "max": max,
+            "count": len,
+        }
+        reducer = reducers[aggregate]
+        return {group: reducer(accumulated[group]) for group in sorted(accumulated)}
+
+class MapTable(ColumnTable):
+    """A :class:`.ColumnTable` of :class:`.Map`\\s."""
+    model = Map
+    schema = {
+        "object_id": "int",
+        "name": "str",
+        "desc": "str",
+        "game_mode_group": "int",
+        "file_name": "str",
+        "file_ext": "str",
+        "author": "int",
+        "author_name": "str",
+        "created": "int",
+        "updated": "int",
+        "game_version": "int",
+        "votes_up": "int",
+        "votes_down": "int",
+        "high_score": "int",
+        "high_score_user": "int",
+        "fully_uploaded": "bool",
+        "map_version": "int",
+        "target_score": "int",
+        "favorites": "int",
+        "deleted": "bool",
+    }
+
+    def group_by_author(
+        self,
+        value: Optional[str] = None,
+        aggregate: Aggregate = "count"
+    ) -> Dict[int, Union[int, float]]:
+        """Aggregate a column per author ID, see :meth:`group_by`.
+
+        :param value: Column to aggregate, e.g. ``"votes_up"``.
+        :param aggregate: ``"sum"``, ``"mean"``, ``"min"``, ``"max"`` or ``"count"``.
+        """
+        return self.group_by("author", value, aggregate)
+
+class HighScoreTable(ColumnTable):
+    """A :class:`.ColumnTable` of :class:`.HighScore`\\s."""
+    model = HighScore
+    schema = {
+        "object_id": "int",
+        "user_id": "int",
+        "map_id": "int",
+        "score": "int",
+        "map_version": "int",
+        "date_made": "int",
+        "username": "str",
+    }
+
+    def group_by_user(
+        self,
+        value: Optional[str] = None,
+        aggregate: Aggregate = "count"
+    ) -> Dict[int, Union[int, float]]:
+        """Aggregate a column per :class:`.User` ID, see :meth:`group_by`.
+
+        :param value: Column to aggregate, e.g. ``"score"``.
+        :param aggregate: ``"sum"``, ``"mean"``, ``"min"``, ``"max"`` or ``"count"``.
+        """
+        return self.group_by("user_id", value, aggregate)
+
+def _or_default(value: Any, default: Any) -> Any:
+    return default if value is None else value
@@ -0,0 +1,248 @@
+from typing import TYPE_CHECKING, Optional, Dict, Iterable, Iterator, Mapping, Union, Tuple, IO
+
+import asyncio
+import hashlib
+import mimetypes
+import os
+
+import aiohttp
+
+from tl3api.errors import HTTPException, NotFound
+from tl3api.map import Map
+
+if TYPE_CHECKING:
+    from tl3api.wrapper import Client
+
+class ThumbnailDownloader:
+    """Mirrors :class:`.Map` thumbnails into a directory.
+
+    Images are streamed to disk in chunks and stored once per content, under their SHA-256 in ``objects/``.
+    ``index.tsv`` maps every :class:`.Map` ID to its image and is appended to after every download, so an interrupted run loses nothing.
+    Downloads in progress are kept in ``partial/`` together with the ETag or Last-Modified of their image, and continued with a Range request on the next run.
+    The Range request carries that validator in ``If-Range``, so an image that changed in the meantime is sent again in full instead of being appended to the old part.
+    Parts without a validator are started over.
+    """
+
+    def __init__(
+        self,
+        client: "Client",
+        directory: str,
+        concurrency: int = 16,
+        chunk_size: int = 65536
+    ):
+        """Initialize a :class:`.ThumbnailDownloader` instance.
+
+        :param client: The :class:`.Client` whose session, rate limiter, concurrency limit, retry policy and observers are used.
+        :param directory: Where images, the index and partial downloads are kept.
+        :param concurrency: Maximum amount of simultaneous downloads.
+        :param chunk_size: Bytes read from the response and written at a time.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        self.client = client
+        self.directory = directory
+        self.concurrency = concurrency
+        self.chunk_size = chunk_size
+        self._index_path = os.path.join(directory, "index.tsv")
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        os.makedirs(os.path.join(directory, "partial"), exist_ok=True)
+        self.index: Dict[int, str] = self._load_index()
+        """Relative image path of every downloaded :class:`.Map` ID."""
+        self.errors: Dict[int, BaseException] = {}
+        """The error of every failed download of the last run."""
+
+    def path(
+        self,
+        map_id: int
+    ) -> Optional[str]:
+        """Return the image file of a :class:`.Map`, ``None`` if it wasn't downloaded."""
+        relative = self.index.get(map_id)
+        return os.path.join(self.directory, relative) if relative is not None else None
+
+    async def download(
+        self,
+        maps: Iterable[Union[int, Map]],
+        force: bool = False
+    ) -> Dict[str, int]:
+        """Download the thumbnails of many maps.
+
+        IDs already in the index are skipped unless ``force`` is set. ``maps`` is consumed lazily.
+
+        :param maps: :class:`.Map` IDs or objects.
+        :param force: Download images that are already present again.
+        :return: Amount of ``downloaded``, ``resumed``, ``deduplicated`` (content already stored), ``skipped``, ``missing`` (404) and ``failed`` maps, and ``bytes`` received. Errors are kept in :attr:`errors`.
+        """
+        self.errors = {}
+        stats = dict.fromkeys(("downloaded", "resumed", "deduplicated", "skipped", "missing", "failed", "bytes"), 0)
+        ids = _map_ids(maps)
+        with open(self._index_path, "a", encoding="utf-8") as index:
+            async def worker():
+                for map_id in ids:
+                    if not force and map_id in self.index and os.path.exists(self.path(map_id)):
+                        stats["skipped"] += 1
+                        continue
+                    try:
+                        await self._download(map_id, index, stats)
+                    except Exception as error:
+                        self.errors[map_id] = error
+                        stats["failed"] += 1
+
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+        return stats
+
+    async def _download(
+        self,
+        map_id: int,
+        index: IO[str],
+        stats: Dict[str, int]
+    ):
+        client = self.client
+        url = client.get_map_thumbnail_url(map_id)
+        part = os.path.join(self.directory, "partial", f"{map_id}.part")
+        validator = os.path.join(self.directory, "partial", f"{map_id}.validator")
+        offset = 0
+
+        def headers() -> Optional[Dict[str, str]]:
+            nonlocal offset
+            # Called before every attempt, whatever arrived before a connection error is continued.
+            offset = os.path.getsize(part) if os.path.exists(part) else 0
+            if not offset:
+                return None
+            value = _read_validator(validator)
+            if value is None:
+                # Without a validator the server can't tell whether the part still belongs to its image.
+                os.remove(part)
+                offset = 0
+                return None
+            return {"Range": f"bytes={offset}-", "If-Range": value}
+
+        async def receive(response: aiohttp.ClientResponse) -> Tuple[str, int, bool, str]:
+            resumed = response.status == 206
+            if resumed and _range_start(response.headers.get("Content-Range")) != offset:
+                raise _Restart()
+            if not resumed:
+                _write_validator(validator, response.headers)
+            digest, received = await self._receive(response, part, resumed)
+            return digest, received, resumed, response.content_type
+
+        while True:
+            try:
+                digest, received, resumed, content_type = await client.stream_response("thumbnail", url, receive, headers)
+            except NotFound:
+                stats["missing"] += 1
+                return
+            except _Restart:
+                _remove(part, validator)
+                continue
+            except HTTPException as error:
+                if error.status != 416:
+                    raise
+                # The partial file doesn't match the image anymore, start over.
+                _remove(part, validator)
+                continue
+            break
+
+        stats["bytes"] += received
+        if resumed:
+            stats["resumed"] += 1
+        self._store(map_id, part, digest, content_type, index, stats)
+        _remove(validator)
+
+    async def _receive(
+        self,
+        response: aiohttp.ClientResponse,
+        part: str,
+        resumed: bool
+    ) -> Tuple[str, int]:
+        hasher = hashlib.sha256()
+        if resumed:
+            with open(part, "rb") as file:
+                for chunk in iter(lambda: file.read(self.chunk_size), b""):
+                    hasher.update(chunk)
+
+        received = 0
+        with open(part, "ab" if resumed else "wb") as file:
+            async for chunk in response.content.iter_chunked(self.chunk_size):
+                hasher.update(chunk)
+                file.write(chunk)
+                received += len(chunk)
+        return hasher.hexdigest(), received
+
+    def _store(
+        self,
+        map_id: int,
+        part: str,
+        digest: str,
+        content_type: str,
+        index: IO[str],
+        stats: Dict[str, int]
+    ):
+        extension = mimetypes.guess_extension(content_type or "") or ""
+        relative = os.path.join("objects", digest[:2], digest + extension)
+        target = os.path.join(self.directory, relative)
+        if os.path.exists(target):
+            os.remove(part)
+            stats["deduplicated"] += 1
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(part, target)
+            stats["downloaded"] += 1
+
+        self.index[map_id] = relative
+        index.write(f"{map_id}\t{relative}\n")
+        index.flush()
+
+    def _load_index(self) -> Dict[int, str]:
+        entries: Dict[int, str] = {}
+        if not os.path.exists(self._index_path):
+            return entries
+        with open(self._index_path, "r", encoding="utf-8") as file:
+            for line in file:
+                map_id, _, relative = line.rstrip("\n").partition("\t")
+                # A line cut off by a crash has no path.
+                if relative:
+                    entries[int(map_id)] = relative
+        return entries
+
+def _map_ids(maps: Iterable[Union[int, Map]]) -> Iterator[int]:
+    seen = set()
+    for item in maps:
+        map_id = item.object_id if isinstance(item, Map) else int(item)
+        if map_id not in seen:
+            seen.add(map_id)
+            yield map_id
+
+def _range_start(value: Optional[str]) -> Optional[int]:
+    # "bytes 100-199/200"
+    if not value or not value.startswith("bytes "):
+        return None
+    start = value[6:].partition("-")[0]
+    return int(start) if start.isdigit() else None
+
+def _read_validator(path: str) -> Optional[str]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read() or None
+
+def _write_validator(
+    path: str,
+    headers: Mapping[str, str]
+):
+    # If-Range needs a strong validator, weak ETags can't be used.
+    etag = headers.get("ETag")
+    value = etag if etag and not etag.startswith("W/") else headers.get("Last-Modified")
+    if value:
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(value)
+    else:
+        _remove(path)
+
+def _remove(*paths: str):
+    for path in paths:
+        if os.path.exists(path):
+            os.remove(path)
+
+class _Restart(Exception):
+    """The server continued a partial download at another offset."""
\ No newline at end of file
@@ -1,4 +1,4 @@
-from typing import TYPE_CHECKING, List
+from typing import TYPE_CHECKING, List, Optional, AsyncIterator
 from tl3api.base import ICObjectBase
 
 if TYPE_CHECKING:
@@ -19,6 +19,8 @@ class User(ICObjectBase):
     ``name``                            The :class:`.User`'s name.
     ``followers``                       Amount of followers the :class:`.User` has.
     """
+    __slots__ = ("game_version", "last_login", "maps", "name", "followers")
+
     object_id: int
     """The ID of the :class:`.User`."""
     game_version: int
@@ -46,4 +48,13 @@ class User(ICObjectBase):
         :param result: Amount of :class:`.Map`s to return on each page.
         :param page: Which page to return.
         """
-        return await self._client.list_maps_by_user(user_id=self.object_id, max_version=max_version, result=result, page=page)
\ No newline at end of file
+        return await self._client.list_maps_by_user(user_id=self.object_id, max_version=max_version, result=result, page=page)
+
+    def iter_user_maps(
+        self, 
+        max_version: int = 999, 
+        result: int = 50, 
+        max_items: Optional[int] = None
+    ) -> AsyncIterator["Map"]:
+        """Iterate over every :class:`.Map` made by the :class:`.User`, fetching pages of ``result`` in the background."""
+        return self._client.iter_maps_by_user(user_id=self.object_id, max_version=max_version, result=result, max_items=max_items)
\ No newline at end of file
@@ -0,0 +1,340 @@
+from typing import TYPE_CHECKING, Optional, Dict, List, Tuple, Any, Callable, Awaitable, AsyncIterator, Literal
+
+import asyncio
+import hashlib
+import heapq
+import time
+
+from tl3api.decoding import JSONLoads, default_loads
+
+if TYPE_CHECKING:
+    from tl3api.wrapper import RawClient
+
+class WatchEvent:
+    """Superclass of the changes a :class:`.Watcher` reports.
+
+    =================================== ================================================
+    Attribute                           Description
+    =================================== ================================================
+    target                              Name of the watched target, e.g.
+                                        ``"top_maps:1:week"``.
+    object_id                           ID of the changed entry.
+    payload                             The entry's decoded JSON.
+    """
+    __slots__ = ("target", "object_id", "payload")
+
+    def __init__(
+        self,
+        target: str,
+        object_id: int,
+        payload: Dict[str, Any]
+    ):
+        self.target = target
+        self.object_id = object_id
+        self.payload = payload
+
+    def __repr__(self) -> str:
+        fields = " ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__ if name != "payload")
+        return f"<{type(self).__name__} target={self.target!r} object_id={self.object_id} {fields}>"
+
+class NewEntry(WatchEvent):
+    """An entry appeared in a top list, ``rank`` starts at 0."""
+    __slots__ = ("rank",)
+
+    def __init__(
+        self,
+        target: str,
+        object_id: int,
+        payload: Dict[str, Any],
+        rank: int
+    ):
+        super().__init__(target, object_id, payload)
+        self.rank = rank
+
+class RankMoved(WatchEvent):
+    """An entry moved from ``old_rank`` to ``new_rank``."""
+    __slots__ = ("old_rank", "new_rank")
+
+    def __init__(
+        self,
+        target: str,
+        object_id: int,
+        payload: Dict[str, Any],
+        old_rank: int,
+        new_rank: int
+    ):
+        super().__init__(target, object_id, payload)
+        self.old_rank = old_rank
+        self.new_rank = new_rank
+
+class VotesChanged(WatchEvent):
+    """The up- or downvotes of a :class:`.Map` in a top list changed by at least the watcher's ``min_vote_change``."""
+    __slots__ = ("votes_up", "votes_down", "delta_up", "delta_down")
+
+    def __init__(
+        self,
+        target: str,
+        object_id: int,
+        payload: Dict[str, Any],
+        votes_up: int,
+        votes_down: int,
+        delta_up: int,
+        delta_down: int
+    ):
+        super().__init__(target, object_id, payload)
+        self.votes_up = votes_up
+        self.votes_down = votes_down
+        self.delta_up = delta_up
+        self.delta_down = delta_down
+
+class NewHighScore(WatchEvent):
+    """A new :class:`.HighScore` entered a map's leaderboard at ``rank``."""
+    __slots__ = ("map_id", "user_id", "score", "rank")
+
+    def __init__(
+        self,
+        target: str,
+        object_id: int,
+        payload: Dict[str, Any],
+        map_id: int,
+        user_id: int,
+        score: int,
+        rank: int
+    ):
+        super().__init__(target, object_id, payload)
+        self.map_id = map_id
+        self.user_id = user_id
+        self.score = score
+        self.rank = rank
+
+class Target:
+    """A polled endpoint of a :class:`.Watcher` and its adaptive interval.
+
+    The interval is multiplied by ``decrease`` whenever the response changed and by ``increase`` whenever it didn't or the poll failed, within ``min_interval`` and ``max_interval``.
+    """
+    __slots__ = (
+        "name", "kind", "fetch", "interval", "min_interval", "max_interval", "digest", "entries", "polls",
+        "changes", "errors", "error", "due"
+    )
+
+    def __init__(
+        self,
+        name: str,
+        kind: Literal["top_maps", "high_scores"],
+        fetch: Callable[[], Awaitable[Optional[bytes]]],
+        min_interval: float,
+        max_interval: float
+    ):
+        self.name = name
+        self.kind = kind
+        self.fetch = fetch
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.digest: Optional[bytes] = None
+        self.entries: Optional[Dict[int, Tuple[int, Dict[str, Any]]]] = None
+        self.polls = 0
+        self.changes = 0
+        self.errors = 0
+        self.error: Optional[BaseException] = None
+        """The error of the last poll, ``None`` if it succeeded."""
+        self.due = 0.0
+
+class Watcher:
+    """Polls top lists and leaderboards and reports what changed.
+
+    Every response body is hashed first, an unchanged one is neither decoded nor diffed.
+    Changed ones are diffed by ``objectId`` against the previous response into :class:`.NewEntry`, :class:`.RankMoved`, :class:`.VotesChanged` and :class:`.NewHighScore` events.
+    The first response of a target only sets the baseline.
+    """
+
+    def __init__(
+        self,
+        client: "RawClient",
+        min_interval: float = 30.0,
+        max_interval: float = 900.0,
+        increase: float = 1.5,
+        decrease: float = 0.5,
+        min_vote_change: int = 1,
+        json_loads: Optional[JSONLoads] = None
+    ):
+        """Initialize a :class:`.Watcher` instance.
+
+        :param client: A :class:`.RawClient` created with ``decode=False``.
+        :param min_interval: Shortest poll interval of a target in seconds.
+        :param max_interval: Longest poll interval of a target in seconds.
+        :param increase: Factor applied to the interval after an unchanged response.
+        :param decrease: Factor applied to the interval after a changed response.
+        :param min_vote_change: Smallest change of up- or downvotes reported as :class:`.VotesChanged`.
+        :param json_loads: Function decoding changed bodies, defaults to the fastest installed decoder, see :func:`.default_loads`.
+        """
+        if getattr(client, "_decode_bodies", True):
+            raise ValueError("the watcher hashes raw bodies, create the RawClient with decode=False")
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("expected 0 < min_interval <= max_interval")
+        if increase < 1 or not 0 < decrease <= 1:
+            raise ValueError("expected increase >= 1 and 0 < decrease <= 1")
+
+        self.client = client
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.increase = increase
+        self.decrease = decrease
+        self.min_vote_change = min_vote_change
+        self._loads = json_loads or default_loads()
+        self.targets: Dict[str, Target] = {}
+
+    def watch_top_maps(
+        self,
+        game_mode: Literal[1, 2, 3],
+        time: Literal["alltime", "month", "week", "day"],
+        result: int = 100,
+        max_version: int = 999
+    ) -> Target:
+        """Watch a top list for new entries, rank moves and vote changes."""
+        async def fetch() -> Optional[bytes]:
+            return await self.client.find_top_maps(game_mode, time, result, max_version, cache_mode="bypass")
+
+        return self._add(f"top_maps:{game_mode}:{time}", "top_maps", fetch)
+
+    def watch_high_scores(
+        self,
+        map_id: int,
+        count: int = 10
+    ) -> Target:
+        """Watch a map's leaderboard for new high scores and rank moves."""
+        async def fetch() -> Optional[bytes]:
+            return await self.client.list_high_scores_on_map(map_id, count, cache_mode="bypass")
+
+        return self._add(f"high_scores:{map_id}", "high_scores", fetch)
+
+    def unwatch(
+        self,
+        name: str
+    ):
+        """Stop polling a target."""
+        self.targets.pop(name, None)
+
+    def _add(
+        self,
+        name: str,
+        kind: Literal["top_maps", "high_scores"],
+        fetch: Callable[[], Awaitable[Optional[bytes]]]
+    ) -> Target:
+        target = self.targets.get(name)
+        if target is None:
+            target = self.targets[name] = Target(name, kind, fetch, self.min_interval, self.max_interval)
+        return target
+
+    async def poll(
+        self,
+        target: Target
+    ) -> List[WatchEvent]:
+        """Fetch a target once, adapt its interval and return its changes."""
+        body = await target.fetch() or b""
+        target.polls += 1
+        target.error = None
+        digest = hashlib.blake2b(body, digest_size=16).digest()
+        if digest == target.digest:
+            target.interval = min(target.max_interval, target.interval * self.increase)
+            return []
+
+        target.digest = digest
+        target.changes += 1
+        target.interval = max(target.min_interval, target.interval * self.decrease)
+
+        entries = {}
+        for rank, entry in enumerate(self._loads(body) if body else []):
+            entries[entry["objectId"]] = (rank, entry)
+        previous, target.entries = target.entries, entries
+        if previous is None:
+            return []
+        if target.kind == "top_maps":
+            return self._diff_top_maps(target.name, previous, entries)
+        return self._diff_high_scores(target.name, previous, entries)
+
+    def _diff_top_maps(
+        self,
+        name: str,
+        previous: Dict[int, Tuple[int, Dict[str, Any]]],
+        entries: Dict[int, Tuple[int, Dict[str, Any]]]
+    ) -> List[WatchEvent]:
+        events: List[WatchEvent] = []
+        for object_id, (rank, entry) in entries.items():
+            old = previous.get(object_id)
+            if old is None:
+                events.append(NewEntry(name, object_id, entry, rank))
+                continue
+
+            old_rank, old_entry = old
+            if old_rank != rank:
+                events.append(RankMoved(name, object_id, entry, old_rank, rank))
+            up, down = entry.get("votesUp", 0), entry.get("votesDown", 0)
+            delta_up, delta_down = up - old_entry.get("votesUp", 0), down - old_entry.get("votesDown", 0)
+            if max(abs(delta_up), abs(delta_down)) >= self.min_vote_change:
+                events.append(VotesChanged(name, object_id, entry, up, down, delta_up, delta_down))
+        return events
+
+    def _diff_high_scores(
+        self,
+        name: str,
+        previous: Dict[int, Tuple[int, Dict[str, Any]]],
+        entries: Dict[int, Tuple[int, Dict[str, Any]]]
+    ) -> List[WatchEvent]:
+        events: List[WatchEvent] = []
+        for object_id, (rank, entry) in entries.items():
+            old = previous.get(object_id)
+            if old is None:
+                events.append(NewHighScore(name, object_id, entry, entry.get("mapId"), entry.get("userId"), entry.get("score"), rank))
+            elif old[0] != rank:
+                events.append(RankMoved(name, object_id, entry, old[0], rank))
+        return events
+
+    async def watch(self) -> AsyncIterator[WatchEvent]:
+        """Poll every target whenever it is due, forever, and yield the changes.
+
+        Targets added or removed while iterating are picked up.
+        A poll that still fails after the client's retries is kept in the target's ``error``, the target backs off like after an unchanged response and the others keep being polled.
+        """
+        queue: List[Tuple[float, str]] = []
+        scheduled = set()
+        while True:
+            now = time.monotonic()
+            for name, target in self.targets.items():
+                if name not in scheduled:
+                    target.due = now
+                    heapq.heappush(queue, (now, name))
+                    scheduled.add(name)
+
+            if not queue:
+                await asyncio.sleep(self.min_interval)
+                continue
+
+            due, _ = queue[0]
+            if due > now:
+                await asyncio.sleep(min(due - now, self.min_interval))
+                continue
+
+            batch = []
+            while queue and queue[0][0] <= now:
+                _, name = heapq.heappop(queue)
+                target = self.targets.get(name)
+                if target is None:
+                    scheduled.discard(name)
+                else:
+                    batch.append(target)
+
+            results = await asyncio.gather(*(self.poll(target) for target in batch), return_exceptions=True)
+            now = time.monotonic()
+            for target, events in zip(batch, results):
+                if isinstance(events, BaseException):
+                    if not isinstance(events, Exception):
+                        raise events
+                    target.errors += 1
+                    target.error = events
+                    target.interval = min(target.max_interval, target.interval * self.increase)
+                    events = []
+                target.due = now + target.interval
+                heapq.heappush(queue, (target.due, target.name))
+                for event in events:
+                    yield event
\ No newline at end of file
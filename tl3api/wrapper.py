@@ -1,22 +1,111 @@
-from typing import Optional, List, Literal
+from typing import Optional, List, Literal, Iterable, Dict, Tuple, Union, Callable, Awaitable, TypeVar, Any, AsyncIterator, Type
 
+import asyncio
+import functools
+import time
 import aiohttp
 
 from tl3api.user import User
 from tl3api.map import Map
 from tl3api.comment import Comment
 from tl3api.high_score import HighScore
+from tl3api.cache import ResponseCache, CacheMode, FRESH, STALE
+from tl3api.store import PayloadStore
+from tl3api.pagination import paginate
+from tl3api.table import ColumnTable, MapTable, HighScoreTable
+from tl3api.base import ICObjectBase
+from tl3api.decoding import JSONLoads, default_loads
+from tl3api.errors import NotFound, http_error
+from tl3api.ratelimit import TokenBucket, SharedTokenBucket, AdaptiveConcurrency, RetryPolicy, parse_retry_after
+from tl3api.identity import IdentityMap
+from tl3api.session import BASE_URL, PoolOptions
+from tl3api.instrumentation import Observer, RequestEvent
+from tl3api.streaming import ArrayParser
+
+T = TypeVar("T")
+
+STREAM_CHUNK_SIZE = 65536
+"""Bytes read from the response at a time by the ``stream_*`` methods."""
+
+# Stands for "no retry argument", since ``None`` disables retries.
+_DEFAULT_RETRY: Any = object()
 
 class Client:
     """A :class: for handling API requests."""
 
-    def __init__(self, session: aiohttp.ClientSession):
+    def __init__(
+        self, 
+        session: Optional[aiohttp.ClientSession] = None, 
+        cache: Optional[ResponseCache] = None, 
+        store: Optional[PayloadStore] = None, 
+        json_loads: Optional[JSONLoads] = None, 
+        rate_limiter: Optional[Union[TokenBucket, SharedTokenBucket]] = None, 
+        concurrency: Optional[AdaptiveConcurrency] = None, 
+        retry: Optional[RetryPolicy] = _DEFAULT_RETRY, 
+        identity_map: Optional[IdentityMap] = None, 
+        base_url: str = BASE_URL, 
+        pool: Optional[PoolOptions] = None, 
+        observers: Iterable[Observer] = ()
+    ):
         """Initialize a :class:`.Client` class instance.
         
-        :param session: An aiohttp client session.
+        :param session: An aiohttp client session, if omitted the :class:`.Client` creates and owns one configured by ``pool``.
+        :param cache: An optional :class:`.ResponseCache`, responses are not cached if omitted.
+        :param store: An optional persistent :class:`.PayloadStore` to read through and write through.
+        :param json_loads: Function decoding response bodies, defaults to the fastest installed decoder, see :func:`.default_loads`.
+        :param rate_limiter: An optional :class:`.TokenBucket` pacing every request, it can be shared between clients, or a :class:`.SharedTokenBucket` shared between processes.
+        :param concurrency: An optional :class:`.AdaptiveConcurrency` limiting requests in flight.
+        :param retry: The :class:`.RetryPolicy` for failed requests, a default policy of its own if omitted, ``None`` disables retries.
+        :param identity_map: The :class:`.IdentityMap` keeping one live :class:`.User` / :class:`.Map` instance per ID, a new one is created if omitted.
+        :param base_url: Root of the API, e.g. to go through a proxy, a regional cache or a local stand-in.
+        :param pool: :class:`.PoolOptions` for the session the :class:`.Client` creates, can't be combined with ``session``.
+        :param observers: :class:`.Observer`\\s receiving a :class:`.RequestEvent` for every request.
 
         """
+        if session is not None and pool is not None:
+            raise ValueError("pool options only apply to a session created by the Client")
+
         self._session = session
+        self._pool = pool or PoolOptions()
+        self._ssl = session is None and self._pool.verify_ssl
+        self._base_url = base_url.rstrip("/")
+        self._cache = cache
+        self._store = store
+        self._loads = json_loads or default_loads()
+        self._rate_limiter = rate_limiter
+        self._concurrency = concurrency
+        self._retry = RetryPolicy() if retry is _DEFAULT_RETRY else retry
+        self._identity = identity_map if identity_map is not None else IdentityMap()
+        self._observers: List[Observer] = list(observers)
+        self._in_flight: Dict[Tuple[str, CacheMode], "asyncio.Future[Any]"] = {}
+        self._revalidations: Dict[str, "asyncio.Task[Any]"] = {}
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        """The :class:`.ResponseCache` used by this :class:`.Client`, if any."""
+        return self._cache
+
+    @property
+    def base_url(self) -> str:
+        """Root of the API this :class:`.Client` talks to."""
+        return self._base_url
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The aiohttp :class:`ClientSession`, created on first use if the :class:`.Client` owns it."""
+        if self._session is None:
+            self._session = self._pool.create_session()
+        return self._session
+
+    @property
+    def identity_map(self) -> IdentityMap:
+        """The :class:`.IdentityMap` used by this :class:`.Client`."""
+        return self._identity
+
+    @property
+    def store(self) -> Optional[PayloadStore]:
+        """The :class:`.PayloadStore` used by this :class:`.Client`, if any."""
+        return self._store
 
     async def __aenter__(self) -> "Client":
         return self
@@ -25,64 +114,589 @@ class Client:
         await self.close()
 
     async def close(self):
-        """Close the aiohttp :class:`ClientSession`."""
-        await self._session.close()
+        """Close the aiohttp :class:`ClientSession` and the :class:`.PayloadStore`."""
+        for task in self._revalidations.values():
+            task.cancel()
+        self._revalidations.clear()
+        if self._store is not None:
+            await asyncio.to_thread(self._store.close)
+        if self._session is not None:
+            await self._session.close()
+
+    def add_observer(
+        self, 
+        observer: Observer
+    ):
+        """Start sending a :class:`.RequestEvent` to ``observer`` after every request."""
+        self._observers.append(observer)
+
+    def remove_observer(
+        self, 
+        observer: Observer
+    ):
+        """Stop sending events to ``observer``."""
+        self._observers.remove(observer)
+
+    def invalidate(
+        self, 
+        url: Optional[str] = None, 
+        endpoint: Optional[str] = None
+    ) -> int:
+        """Drop cached responses, see :meth:`.ResponseCache.invalidate`."""
+        if self._cache is None:
+            return 0
+        return self._cache.invalidate(key=url, endpoint=endpoint)
+
+    async def _request(
+        self, 
+        url: str, 
+        handle: Callable[[aiohttp.ClientResponse], AsyncIterator[T]], 
+        event: Optional[RequestEvent] = None, 
+        headers: Optional[Callable[[], Optional[Dict[str, str]]]] = None
+    ) -> AsyncIterator[T]:
+        """Send a GET request paced by the rate limiter and the concurrency limit and retry failures with backoff.
+
+        ``handle`` turns a response below 400 into items. Connection and payload errors it raises are retried as long as no item was yielded.
+        Other statuses raise an :class:`.HTTPException` once the :class:`.RetryPolicy` gives up.
+
+        :param url: The requested url.
+        :param handle: Async generator function reading a successful response.
+        :param event: The :class:`.RequestEvent` to fill in, if observed.
+        :param headers: Called before every attempt for the request headers.
+        """
+        attempt = 0
+        yielded = False
+        while True:
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire()
+            if self._concurrency is not None:
+                await self._concurrency.acquire()
+
+            outcome = "error"
+            if event is not None:
+                event.attempts += 1
+                sent = time.perf_counter()
+            try:
+                async with self.session.get(url, headers=headers() if headers is not None else None, ssl=self._ssl) as response:
+                    status = response.status
+                    if event is not None:
+                        event.status = status
+                        event.ttfb = time.perf_counter() - sent
+                        event.response_bytes = 0
+
+                    if status < 400:
+                        async for item in handle(response):
+                            yielded = True
+                            yield item
+                        outcome = "success"
+                        return
+
+                    body = await response.read()
+                    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError):
+                # Items that were already handed out can't be taken back, so only retry before the first one.
+                if yielded or self._retry is None or not self._retry.should_retry(attempt):
+                    raise
+                status = None
+                retry_after = None
+            else:
+                if event is not None:
+                    event.response_bytes = len(body)
+                if status in (429, 503):
+                    outcome = "throttled"
+                    if retry_after is not None and self._rate_limiter is not None:
+                        self._rate_limiter.pause(retry_after)
+                if self._retry is None or not self._retry.should_retry(attempt, status):
+                    raise http_error(status, url, body, retry_after)
+            finally:
+                if self._concurrency is not None:
+                    await self._concurrency.release(outcome)
+
+            await asyncio.sleep(self._retry.delay(attempt, retry_after))
+            attempt += 1
+
+    async def _fetch(
+        self, 
+        url: str, 
+        event: Optional[RequestEvent] = None
+    ) -> bytes:
+        async def read(response: aiohttp.ClientResponse) -> AsyncIterator[bytes]:
+            body = await response.read()
+            if event is not None:
+                event.response_bytes = len(body)
+            yield body
+
+        bodies = [body async for body in self._request(url, read, event)]
+        return bodies[0]
+
+    async def _stream(
+        self, 
+        endpoint: str, 
+        url: str, 
+        cls: Type[ICObjectBase]
+    ) -> AsyncIterator[Any]:
+        event = RequestEvent(endpoint, url) if self._observers else None
+        start = time.perf_counter()
+
+        async def parse(response: aiohttp.ClientResponse) -> AsyncIterator[Any]:
+            parser = ArrayParser()
+            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                if event is not None:
+                    event.response_bytes += len(chunk)
+                for element in self._timed_feed(parser, chunk, event):
+                    yield element
+            for element in self._timed_feed(parser, None, event):
+                yield element
+
+        elements = self._request(url, parse, event)
+        try:
+            async for element in elements:
+                yield self._timed_build(cls, element, event)
+        except BaseException as error:
+            if event is not None and not isinstance(error, GeneratorExit):
+                event.error = error
+            raise
+        finally:
+            await elements.aclose()
+            if event is not None:
+                self._emit(event, start)
+
+    def _emit(
+        self, 
+        event: RequestEvent, 
+        start: float
+    ):
+        event.latency = time.perf_counter() - start
+        for observer in self._observers:
+            observer.on_request(event)
+
+    def _timed_feed(
+        self, 
+        parser: ArrayParser, 
+        chunk: Optional[bytes], 
+        event: Optional[RequestEvent]
+    ) -> List[Any]:
+        if event is None:
+            return parser.feed(chunk) if chunk is not None else parser.close()
+        start = time.perf_counter()
+        try:
+            return parser.feed(chunk) if chunk is not None else parser.close()
+        finally:
+            event.decode_time += time.perf_counter() - start
+
+    def _timed_build(
+        self, 
+        cls: Type[ICObjectBase], 
+        payload: Any, 
+        event: Optional[RequestEvent]
+    ) -> Any:
+        if event is None:
+            return self._build(cls, payload)
+        start = time.perf_counter()
+        try:
+            return self._build(cls, payload)
+        finally:
+            event.build_time += time.perf_counter() - start
+
+    def _decode(
+        self, 
+        body: bytes
+    ) -> Any:
+        return self._loads(body) if body else None
+
+    def _timed_decode(
+        self, 
+        body: bytes, 
+        event: Optional[RequestEvent]
+    ) -> Any:
+        if event is None:
+            return self._decode(body)
+        start = time.perf_counter()
+        try:
+            return self._decode(body)
+        finally:
+            event.decode_time += time.perf_counter() - start
+
+    async def _load(
+        self, 
+        endpoint: str, 
+        url: str, 
+        cache_mode: CacheMode, 
+        object_id: Optional[int], 
+        event: Optional[RequestEvent]
+    ) -> Any:
+        store = self._store
+        if store is None or endpoint not in store.endpoints or cache_mode == "bypass":
+            return self._timed_decode(await self._fetch(url, event), event)
+
+        if cache_mode == "use":
+            body = await asyncio.to_thread(store.get, endpoint, url)
+            if body is not None:
+                if event is not None:
+                    event.source = "store"
+                    event.response_bytes = len(body)
+                return self._timed_decode(body, event)
+
+        body = await self._fetch(url, event)
+        value = self._timed_decode(body, event)
+        if body:
+            # A full batch commits inside put, keep that off the event loop.
+            await asyncio.to_thread(store.put, endpoint, url, object_id, body)
+        return value
+
+    async def _get(
+        self, 
+        endpoint: str, 
+        url: str, 
+        cache_mode: CacheMode = "use", 
+        object_id: Optional[int] = None, 
+        build: Optional[Callable[[Any], Any]] = None
+    ) -> Any:
+        if not self._observers:
+            value = await self._lookup(endpoint, url, cache_mode, object_id, None)
+            return build(value) if build is not None else value
+
+        event = RequestEvent(endpoint, url)
+        start = time.perf_counter()
+        try:
+            value = await self._lookup(endpoint, url, cache_mode, object_id, event)
+            if build is not None:
+                built = time.perf_counter()
+                value = build(value)
+                event.build_time = time.perf_counter() - built
+            return value
+        except BaseException as error:
+            event.error = error
+            raise
+        finally:
+            self._emit(event, start)
+
+    async def _lookup(
+        self, 
+        endpoint: str, 
+        url: str, 
+        cache_mode: CacheMode, 
+        object_id: Optional[int], 
+        event: Optional[RequestEvent]
+    ) -> Any:
+        cache = self._cache
+        if cache is not None and cache_mode == "use":
+            state, value = cache.lookup(url)
+            if state == FRESH:
+                if event is not None:
+                    event.source = "cache"
+                return value
+            if state == STALE:
+                if event is not None:
+                    event.source = "stale"
+                self._revalidate(endpoint, url, object_id)
+                return value
+
+        # Concurrent requests for the same url share a single call, as long as they accept the same sources.
+        key = (url, cache_mode)
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._load_and_cache(endpoint, url, cache_mode, object_id, event))
+            self._in_flight[key] = future
+            future.add_done_callback(functools.partial(self._landed, key))
+        elif event is not None:
+            event.source = "coalesced"
+        return await asyncio.shield(future)
+
+    async def _load_and_cache(
+        self, 
+        endpoint: str, 
+        url: str, 
+        cache_mode: CacheMode, 
+        object_id: Optional[int], 
+        event: Optional[RequestEvent]
+    ) -> Any:
+        value = await self._load(endpoint, url, cache_mode, object_id, event)
+        if self._cache is not None and cache_mode != "bypass":
+            self._cache.store(endpoint, url, value)
+        return value
+
+    def _landed(
+        self, 
+        key: Tuple[str, CacheMode], 
+        future: "asyncio.Future[Any]"
+    ):
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        if not future.cancelled():
+            # Mark the error as retrieved in case every waiter was cancelled.
+            future.exception()
+
+    def _decoded(
+        self, 
+        payload: Any
+    ) -> Any:
+        return payload
+
+    def _build(
+        self, 
+        cls: Type[ICObjectBase], 
+        payload: Any
+    ) -> Any:
+        obj = cls(self, payload)
+        if cls is User or cls is Map:
+            obj = self._identity.add(obj)
+        return obj
+
+    def _build_many(
+        self, 
+        cls: Type[ICObjectBase], 
+        payload: Any
+    ) -> Any:
+        if cls is User or cls is Map:
+            add = self._identity.add
+            return [add(cls(self, item)) for item in payload]
+        return [cls(self, item) for item in payload]
+
+    def _table(
+        self, 
+        cls: Type[ColumnTable], 
+        payload: Any
+    ) -> ColumnTable:
+        return cls.from_payload(self, payload)
+
+    def _builder(
+        self, 
+        cls: Type[ICObjectBase], 
+        table: Optional[Type[ColumnTable]] = None
+    ) -> Callable[[Any], Any]:
+        if table is not None:
+            return functools.partial(self._table, table)
+        return functools.partial(self._build_many, cls)
+
+    def _build_optional(
+        self, 
+        cls: Type[ICObjectBase], 
+        payload: Any
+    ) -> Any:
+        return self._build(cls, payload) if payload else None
+
+    def _paginate(
+        self, 
+        fetch_page: Callable[[Any], Awaitable[List[Any]]], 
+        first_cursor: Any, 
+        next_cursor: Callable[[Any, List[Any]], Any], 
+        page_size: int, 
+        max_items: Optional[int]
+    ) -> AsyncIterator[Any]:
+        return paginate(fetch_page, first_cursor, next_cursor, page_size, max_items)
+
+    def _revalidate(
+        self, 
+        endpoint: str, 
+        url: str, 
+        object_id: Optional[int]
+    ):
+        if url in self._revalidations:
+            return
+
+        task = asyncio.ensure_future(self._get(endpoint, url, "refresh", object_id))
+        self._revalidations[url] = task
+        task.add_done_callback(functools.partial(self._revalidated, url))
+
+    def _revalidated(
+        self, 
+        url: str, 
+        task: "asyncio.Task[Any]"
+    ):
+        self._revalidations.pop(url, None)
+        if not task.cancelled():
+            # Failed refreshes keep serving the stale entry until it expires.
+            task.exception()
 
     async def get_details_for_user(
         self, 
-        user_id: int
+        user_id: int, 
+        cache_mode: CacheMode = "use"
     ) -> Optional[User]:
         """Create a :class:`.User` instance from its ID.
+
+        Returns ``None`` if the :class:`.User` doesn't exist, other failures raise an :class:`.HTTPException`.
         
         :param user_id: The :class:`.User`'s ID.
+        :param cache_mode: How to use the :class:`.ResponseCache`, see :data:`.CacheMode`.
         """
-        async with self._session.get("https://tl3.shadowtree-software.se/TL3BackEnd/rest/user2/public/info/" + str(user_id), verify_ssl=False) as response:
-            try:
-                user =  User(self, await response.json())
-            except:
-                user = None
-
-        return user
+        try:
+            return await self._get("user", f"{self._base_url}/user2/public/info/{user_id}", cache_mode, user_id, functools.partial(self._build_optional, User))
+        except NotFound:
+            return None
 
     async def search_for_users(
         self, 
         query: str, 
         result: int, 
-        page: int = 0
+        page: int = 0, 
+        cache_mode: CacheMode = "use"
     ) -> List[User]:
         """Create a list of :class:`.User`s with names similar to the specified query.
+
+        Users that no longer exist are ``None``, other failures raise the first error that remained after retrying.
         
         :param query: Name to search for.
         :param result: Amount of :class:`.User`s to return on each page.
         :param page: Which page to return.
+        :param cache_mode: How to use the :class:`.ResponseCache`, see :data:`.CacheMode`.
         """
-        async with self._session.get(f"https://tl3.shadowtree-software.se/TL3BackEnd/rest/user2/public/search?result={result}&page={page}&query={query}", verify_ssl=False) as response:
-            users = await response.json()
+        users = await self._get("user_search", f"{self._base_url}/user2/public/search?result={result}&page={page}&query={query}", cache_mode)
 
-        users = [await self.get_details_for_user(User(self, user).object_id) for user in users]
+        ids = [user["objectId"] for user in self._decoded(users)]
+        details = await self.get_details_for_users(ids, cache_mode=cache_mode)
+        for detail in details.values():
+            # Missing users are already None, anything else is a real failure.
+            if isinstance(detail, BaseException):
+                raise detail
+        users = [details[i] for i in ids]
         return users
 
+    async def get_details_for_users(
+        self, 
+        user_ids: Iterable[int], 
+        concurrency: int = 10, 
+        cache_mode: CacheMode = "use"
+    ) -> Dict[int, Union[Optional[User], BaseException]]:
+        """Create :class:`.User` instances for many IDs at once.
+
+        Duplicate IDs are only requested once and at most ``concurrency`` requests are in flight at the same time.
+        
+        :param user_ids: The :class:`.User`s' IDs.
+        :param concurrency: Maximum amount of simultaneous requests.
+        :param cache_mode: How to use the :class:`.ResponseCache`, see :data:`.CacheMode`.
+        :return: A :class:`dict` mapping every distinct ID, in input order, to its :class:`.User`, or to the exception raised while fetching it.
+        """
+        return await self._gather_many(functools.partial(self.get_details_for_user, cache_mode=cache_mode), user_ids, concurrency)
+
+    async def get_map_details_many(
+        self, 
+        map_ids: Iterable[int], 
+        concurrency: int = 10, 
+        cache_mode: CacheMode = "use"
+    ) -> Dict[int, Union[Optional[Map], BaseException]]:
+        """Create :class:`.Map` instances for many IDs at once.
+
+        Duplicate IDs are only requested once and at most ``concurrency`` requests are in flight at the same time.
+        
+        :param map_ids: The :class:`.Map`s' IDs.
+        :param concurrency: Maximum amount of simultaneous requests.
+        :param cache_mode: How to use the :class:`.ResponseCache`, see :data:`.CacheMode`.
+        :return: A :class:`dict` mapping every distinct ID, in input order, to its :class:`.Map`, or to the exception raised while fetching it.
+        """
+        return await self._gather_many(functools.partial(self.get_map_details, cache_mode=cache_mode), map_ids, concurrency)
+
+    async def _gather_many(
+        self, 
+        fetch: Callable[[int], Awaitable[T]], 
+        ids: Iterable[int], 
+        concurrency: int
+    ) -> Dict[int, Union[T, BaseException]]:
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+
+        unique = list(dict.fromkeys(ids))
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(object_id: int) -> T:
+            async with semaphore:
+                return await fetch(object_id)
+
+        results = await asyncio.gather(*(run(object_id) for object_id in unique), return_exceptions=True)
+        return dict(zip(unique, results))
+
     def get_map_thumbnail_url(
         self, 
         map_id: int
     ) -> str:
         """Returns the thumbnail url for a :class:`.Map`."""
-        return f"https://tl3.shadowtree-software.se/TL3BackEnd/rest/map/public/{map_id}/thumb"
+        return f"{self._base_url}/map/public/{map_id}/thumb"
+
+    async def stream_response(
+        self, 
+        endpoint: str, 
+        url: str, 
+        receive: Callable[[aiohttp.ClientResponse], Awaitable[T]], 
+        headers: Optional[Callable[[], Optional[Dict[str, str]]]] = None
+    ) -> T:
+        """Send a GET request through the rate limiter, concurrency limit and :class:`.RetryPolicy` and let ``receive`` read the response, e.g. in chunks to a file.
+
+        Connection and payload errors raised by ``receive`` are retried, so it has to cope with being called again.
+        Statuses of 400 and above raise an :class:`.HTTPException` once retrying gives up, a :class:`.RequestEvent` is sent to the observers either way.
+        Responses are neither cached nor stored.
+
+        :param endpoint: The endpoint name reported in the :class:`.RequestEvent`.
+        :param url: The requested url, e.g. from :meth:`get_map_thumbnail_url`.
+        :param receive: Reads a response with a status below 400 and returns the result.
+        :param headers: Called before every attempt for the request headers, e.g. a Range header continuing what already arrived.
+        :return: What ``receive`` returned.
+        """
+        event = RequestEvent(endpoint, url) if self._observers else None
+        start = time.perf_counter()
+
+        async def handle(response: aiohttp.ClientResponse) -> AsyncIterator[T]:
+            result = await receive(response)
+            if event is not None:
+                event.response_bytes = response.content.total_bytes
+            yield result
+
+        try:
+            results = [result async for result in self._request(url, handle, event, headers)]
+        except BaseException as error:
+            if event is not None:
+                event.error = error
+            raise
+        finally:
+            if event is not None:
+                self._emit(event, start)
+        return results[0]
 
     async def get_map_details(
         self, 
-        map_id: int
+        map_id: int, 
+        cache_mode: CacheMode = "use"
     ) -> Optional[Map]:
         """Create a :class:`.Map` instance from its ID.
+
+        Returns ``None`` if the :class:`.Map` doesn't exist, other failures raise an :class:`.HTTPException`.
         
         :param map_id: The :class:`.Map`'s ID.
+        :param cache_mode: How to use the :class:`.ResponseCache`, see :data:`.CacheMode`.
         """
-        async with self._session.get(f"https://tl3.shadowtree-software.se/TL3BackEnd/rest/map/public/{map_id}/meta", verify_ssl=False) as response:
-            try:
-                _map = Map(self, await response.json())
-            except:
-                _map = None
+        try:
+            return await self._get("map", f"{self._base_url}/map/public/{map_id}/meta", cache_mode, map_id, functools.partial(self._build_optional, Map))
+        except NotFound:
+            return None
+
+    async def resolve_user(
+        self, 
+        user_id: int
+    ) -> Optional[User]:
+        """Return the live :class:`.User` with this ID, fetching it only if this :class:`.Client` doesn't hold one yet.
 
+        Concurrent calls for the same ID share a single request, so resolving the authors of a list of objects costs one request per distinct :class:`.User`.
+        
+        :param user_id: The :class:`.User`'s ID.
+        """
+        user = self._identity.get(User, user_id)
+        if user is None:
+            user = await self.get_details_for_user(user_id)
+        return user
+
+    async def resolve_map(
+        self, 
+        map_id: int
+    ) -> Optional[Map]:
+        """Return the live :class:`.Map` with this ID, fetching it only if this :class:`.Client` doesn't hold one yet.
+
+        Concurrent calls for the same ID share a single request.
+        
+        :param map_id: The :class:`.Map`'s ID.
+        """
+        _map = self._identity.get(Map, map_id)
+        if _map is None:
+            _map = await self.get_map_details(map_id)
         return _map
 
     async def list_maps_by_user(
@@ -90,19 +704,20 @@ class Client:
         user_id: int, 
         max_version: int = 999, 
         result: int = 50, 
-        page: int = 0
-    ) -> List[Map]:
+        page: int = 0, 
+        cache_mode: CacheMode = "use", 
+        as_table: bool = False
+    ) -> Union[List[Map], MapTable]:
         """Return a :class:`List` of :class:`.Map`'s made by the :class:`.User`.
         
         :param user_id: ID of the :class:`.User`.
         :param max_version: The requester's game version, so if you have version 10 of the app you will not get :class:`.Map`s that were made using 20 and might not be possible to play. 
         :param result: Amount of :class:`.Map`s to return on each page.
         :param page: Which page to return.
+        :param cache_mode: How to use the :class:`.ResponseCache`, see :data:`.CacheMode`.
+        :param as_table: Return a columnar :class:`.MapTable` instead of a list of :class:`.Map` objects.
         """
-        async with self._session.get(f"https://tl3.shadowtree-software.se/TL3BackEnd/rest/map/public/user/{user_id}?maxversion={max_version}&result={result}&page={page}", verify_ssl=False) as response:
-            maps = await response.json()
-
-        maps = [Map(self, _map) for _map in maps]
+        maps = await self._get("user_maps", f"{self._base_url}/map/public/user/{user_id}?maxversion={max_version}&result={result}&page={page}", cache_mode, build=self._builder(Map, MapTable if as_table else None))
         return maps
 
     async def search_for_maps(
@@ -111,7 +726,8 @@ class Client:
         game_mode: Literal[1, 2, 3], 
         result: int, 
         page: int = 0, 
-        max_version: int = 999
+        max_version: int = 999, 
+        cache_mode: CacheMode = "use"
     ) -> List[Map]:
         """Create a list of :class:`.Map`s with names similar to the specified query.
         
@@ -120,11 +736,9 @@ class Client:
         :param result: Amount of :class:`.Map`s to return on each page.
         :param page: Which page to return.
         :param max_version: The requester's game version, so if you have version 10 of the app you will not get :class:`.Map`s that were made using 20 and might not be possible to play. 
+        :param cache_mode: How to use the :class:`.ResponseCache`, see :data:`.CacheMode`.
         """
-        async with self._session.get(f"https://tl3.shadowtree-software.se/TL3BackEnd/rest/map/public/top/{game_mode}/search?maxversion={max_version}&result={result}&page={page}&query={query}", verify_ssl=False) as response:
-            maps = await response.json()
-
-        maps = [Map(self, _map) for _map in maps]
+        maps = await self._get("map_search", f"{self._base_url}/map/public/top/{game_mode}/search?maxversion={max_version}&result={result}&page={page}&query={query}", cache_mode, build=self._builder(Map))
         return maps
 
     async def list_new_maps(
@@ -132,19 +746,20 @@ class Client:
         game_mode: Literal[1, 2, 3], 
         result: int, 
         page: int = 0, 
-        max_version: int = 999
-    ) -> List[Map]:
+        max_version: int = 999, 
+        cache_mode: CacheMode = "use", 
+        as_table: bool = False
+    ) -> Union[List[Map], MapTable]:
         """Create a list of :class:`.Map`s that were recently uploaded.
         
         :param game_mode: 1 => Simulation, 2 => Traffic Controller, 3 => Miscellaneous.
         :param result: Amount of :class:`.Map`s to return on each page.
         :param page: Which page to return.
         :param max_version: The requester's game version, so if you have version 10 of the app you will not get :class:`.Map`s that were made using 20 and might not be possible to play. 
+        :param cache_mode: How to use the :class:`.ResponseCache`, see :data:`.CacheMode`.
+        :param as_table: Return a columnar :class:`.MapTable` instead of a list of :class:`.Map` objects.
         """
-        async with self._session.get(f"https://tl3.shadowtree-software.se/TL3BackEnd/rest/map/public/new/{game_mode}?maxversion={max_version}&result={result}&page={page}", verify_ssl=False) as response:
-            maps = await response.json()
-
-        maps = [Map(self, _map) for _map in maps]
+        maps = await self._get("new_maps", f"{self._base_url}/map/public/new/{game_mode}?maxversion={max_version}&result={result}&page={page}", cache_mode, build=self._builder(Map, MapTable if as_table else None))
         return maps
 
     async def find_top_maps(
@@ -155,8 +770,10 @@ class Client:
         max_version: int = 999, 
         page: int = 0, 
         offset: int = 0, 
-        trendsystem: Literal[0, 1] = 1
-    ) -> List[Map]:
+        trendsystem: Literal[0, 1] = 1, 
+        cache_mode: CacheMode = "use", 
+        as_table: bool = False
+    ) -> Union[List[Map], MapTable]:
         """Create a list of :class:`.Map` that currently are in one of the top categories.
         
         :param game_mode: 1 => Simulation, 2 => Traffic Controller, 3 => Miscellaneous.
@@ -166,49 +783,347 @@ class Client:
         :param page: Which page to return.
         :param offset: How many weeks / months / days from today to give results for, negative to go back in time, positive will give future and thus usually an empty list.
         :param trendsystem: Should always be set to 1 as that is the current version used ingame. 
+        :param cache_mode: How to use the :class:`.ResponseCache`, see :data:`.CacheMode`.
+        :param as_table: Return a columnar :class:`.MapTable` instead of a list of :class:`.Map` objects.
         """
 
-        async with self._session.get(f"https://tl3.shadowtree-software.se/TL3BackEnd/rest/map/public/top/{game_mode}/{time}?maxversion={max_version}&result={result}&page={page}&trendsystem={trendsystem}&offset={offset}", verify_ssl=False) as response:
-            maps = await response.json()
-
-        maps = [Map(self, _map) for _map in maps]
+        maps = await self._get("top_maps", f"{self._base_url}/map/public/top/{game_mode}/{time}?maxversion={max_version}&result={result}&page={page}&trendsystem={trendsystem}&offset={offset}", cache_mode, build=self._builder(Map, MapTable if as_table else None))
         return maps
 
     async def list_comments_on_map(
         self, 
         map_id: int, 
         limit: int, 
-        before: Optional[int] = None
+        before: Optional[int] = None, 
+        cache_mode: CacheMode = "use"
     ) -> List[Comment]:
         """Create a list of :class:`.Comment`s under a certain :class:`.Map`.
         
         :param map_id: ID of the :class:`.Map`.
         :param limit: Amount of :class:`.Comment`s to return.
         :param before: ID of :class:`.Comment` to fetch results after, in order to not get duplicates.
+        :param cache_mode: How to use the :class:`.ResponseCache`, see :data:`.CacheMode`.
         """
 
         if before: before = f"&before={before}"
         else: before = ""
 
-        async with self._session.get(f"https://tl3.shadowtree-software.se/TL3BackEnd/rest/comment/public/{map_id}?limit={limit}{before}", verify_ssl=False) as response:
-            comments = await response.json()
-        
-        comments = [Comment(self, comment) for comment in comments]
+        comments = await self._get("comments", f"{self._base_url}/comment/public/{map_id}?limit={limit}{before}", cache_mode, map_id, self._builder(Comment))
         return comments
 
     async def list_high_scores_on_map(
         self, 
         map_id: int, 
-        count: int
-    ) -> List[HighScore]:
+        count: int, 
+        cache_mode: CacheMode = "use", 
+        as_table: bool = False
+    ) -> Union[List[HighScore], HighScoreTable]:
         """Return :class:`.HighScore`s from a certain :class:`.Map`.
         
         :param map_id: ID of the :class:`.Map`.
         :param count: Amount of :class:`.HighScore`s to get.
+        :param cache_mode: How to use the :class:`.ResponseCache`, see :data:`.CacheMode`.
+        :param as_table: Return a columnar :class:`.HighScoreTable` instead of a list of :class:`.HighScore` objects.
+        """
+
+        high_scores = await self._get("high_scores", f"{self._base_url}/highscore/public/{map_id}?count={count}", cache_mode, map_id, self._builder(HighScore, HighScoreTable if as_table else None))
+        return high_scores
+
+    def stream_new_maps(
+        self, 
+        game_mode: Literal[1, 2, 3], 
+        result: int, 
+        page: int = 0, 
+        max_version: int = 999
+    ) -> AsyncIterator[Map]:
+        """Like :meth:`list_new_maps`, but yields every :class:`.Map` as soon as it was received.
+
+        The response is parsed while it arrives, so the first :class:`.Map` is available early and memory stays bounded for large pages.
+        The :class:`.ResponseCache` and :class:`.PayloadStore` are bypassed.
+        
+        :param game_mode: 1 => Simulation, 2 => Traffic Controller, 3 => Miscellaneous.
+        :param result: Amount of :class:`.Map`s to return.
+        :param page: Which page to get results from.
+        :param max_version: The requester's game version.
+        """
+        return self._stream("new_maps", f"{self._base_url}/map/public/new/{game_mode}?maxversion={max_version}&result={result}&page={page}", Map)
+
+    def stream_top_maps(
+        self, 
+        game_mode: Literal[1, 2, 3], 
+        time: Literal["alltime", "month", "week", "day"], 
+        result: int, 
+        max_version: int = 999, 
+        page: int = 0, 
+        offset: int = 0, 
+        trendsystem: Literal[0, 1] = 1
+    ) -> AsyncIterator[Map]:
+        """Like :meth:`find_top_maps`, but yields every :class:`.Map` as soon as it was received, see :meth:`stream_new_maps`.
+        
+        :param game_mode: 1 => Simulation, 2 => Traffic Controller, 3 => Miscellaneous.
+        :param time: Which trending category to use.
+        :param result: Amount of :class:`.Map`s to return.
+        :param max_version: The requester's game version.
+        :param page: Which page to get results from.
+        :param offset: How many weeks / months / days from today to give results for.
+        :param trendsystem: Should always be set to 1 as that is the current version used ingame. 
+        """
+        return self._stream("top_maps", f"{self._base_url}/map/public/top/{game_mode}/{time}?maxversion={max_version}&result={result}&page={page}&trendsystem={trendsystem}&offset={offset}", Map)
+
+    def stream_comments_on_map(
+        self, 
+        map_id: int, 
+        limit: int, 
+        before: Optional[int] = None
+    ) -> AsyncIterator[Comment]:
+        """Like :meth:`list_comments_on_map`, but yields every :class:`.Comment` as soon as it was received, see :meth:`stream_new_maps`.
+        
+        :param map_id: ID of the :class:`.Map`.
+        :param limit: Amount of :class:`.Comment`s to return.
+        :param before: ID of :class:`.Comment` to fetch results after.
+        """
+        before = f"&before={before}" if before else ""
+        return self._stream("comments", f"{self._base_url}/comment/public/{map_id}?limit={limit}{before}", Comment)
+
+    def stream_high_scores_on_map(
+        self, 
+        map_id: int, 
+        count: int
+    ) -> AsyncIterator[HighScore]:
+        """Like :meth:`list_high_scores_on_map`, but yields every :class:`.HighScore` as soon as it was received, see :meth:`stream_new_maps`.
+        
+        :param map_id: ID of the :class:`.Map`.
+        :param count: Amount of :class:`.HighScore`s to get.
+        """
+        return self._stream("high_scores", f"{self._base_url}/highscore/public/{map_id}?count={count}", HighScore)
+
+    def iter_search_users(
+        self, 
+        query: str, 
+        result: int = 50, 
+        page: int = 0, 
+        max_items: Optional[int] = None, 
+        cache_mode: CacheMode = "use"
+    ) -> AsyncIterator[Optional[User]]:
+        """Iterate over every :class:`.User` matching a query, see :meth:`search_for_users`.
+
+        The next page is fetched in the background while the current one is consumed.
+        
+        :param query: Name to search for.
+        :param result: Amount of :class:`.User`s to request on each page.
+        :param page: Which page to start at.
+        :param max_items: Maximum amount of :class:`.User`s to return, unlimited if omitted.
+        :param cache_mode: How to use the :class:`.ResponseCache`, see :data:`.CacheMode`.
         """
+        return self._paginate(
+            lambda page: self.search_for_users(query=query, result=result, page=page, cache_mode=cache_mode),
+            page, _next_page, result, max_items
+        )
+
+    def iter_maps_by_user(
+        self, 
+        user_id: int, 
+        max_version: int = 999, 
+        result: int = 50, 
+        page: int = 0, 
+        max_items: Optional[int] = None, 
+        cache_mode: CacheMode = "use"
+    ) -> AsyncIterator[Map]:
+        """Iterate over every :class:`.Map` made by a :class:`.User`, see :meth:`list_maps_by_user`.
+
+        The next page is fetched in the background while the current one is consumed.
+        
+        :param user_id: ID of the :class:`.User`.
+        :param max_version: The requester's game version.
+        :param result: Amount of :class:`.Map`s to request on each page.
+        :param page: Which page to start at.
+        :param max_items: Maximum amount of :class:`.Map`s to return, unlimited if omitted.
+        :param cache_mode: How to use the :class:`.ResponseCache`, see :data:`.CacheMode`.
+        """
+        return self._paginate(
+            lambda page: self.list_maps_by_user(user_id=user_id, max_version=max_version, result=result, page=page, cache_mode=cache_mode),
+            page, _next_page, result, max_items
+        )
+
+    def iter_search_maps(
+        self, 
+        query: str, 
+        game_mode: Literal[1, 2, 3], 
+        result: int = 50, 
+        page: int = 0, 
+        max_version: int = 999, 
+        max_items: Optional[int] = None, 
+        cache_mode: CacheMode = "use"
+    ) -> AsyncIterator[Map]:
+        """Iterate over every :class:`.Map` matching a query, see :meth:`search_for_maps`.
+
+        The next page is fetched in the background while the current one is consumed.
+        
+        :param query: Name to search for.
+        :param game_mode: 1 => Simulation, 2 => Traffic Controller, 3 => Miscellaneous.
+        :param result: Amount of :class:`.Map`s to request on each page.
+        :param page: Which page to start at.
+        :param max_version: The requester's game version.
+        :param max_items: Maximum amount of :class:`.Map`s to return, unlimited if omitted.
+        :param cache_mode: How to use the :class:`.ResponseCache`, see :data:`.CacheMode`.
+        """
+        return self._paginate(
+            lambda page: self.search_for_maps(query=query, game_mode=game_mode, result=result, page=page, max_version=max_version, cache_mode=cache_mode),
+            page, _next_page, result, max_items
+        )
+
+    def iter_new_maps(
+        self, 
+        game_mode: Literal[1, 2, 3], 
+        result: int = 50, 
+        page: int = 0, 
+        max_version: int = 999, 
+        max_items: Optional[int] = None, 
+        cache_mode: CacheMode = "use"
+    ) -> AsyncIterator[Map]:
+        """Iterate over recently uploaded :class:`.Map`s, newest first, see :meth:`list_new_maps`.
+
+        The next page is fetched in the background while the current one is consumed.
+        
+        :param game_mode: 1 => Simulation, 2 => Traffic Controller, 3 => Miscellaneous.
+        :param result: Amount of :class:`.Map`s to request on each page.
+        :param page: Which page to start at.
+        :param max_version: The requester's game version.
+        :param max_items: Maximum amount of :class:`.Map`s to return, unlimited if omitted.
+        :param cache_mode: How to use the :class:`.ResponseCache`, see :data:`.CacheMode`.
+        """
+        return self._paginate(
+            lambda page: self.list_new_maps(game_mode=game_mode, result=result, page=page, max_version=max_version, cache_mode=cache_mode),
+            page, _next_page, result, max_items
+        )
+
+    def iter_top_maps(
+        self, 
+        game_mode: Literal[1, 2, 3], 
+        time: Literal["alltime", "month", "week", "day"], 
+        result: int = 50, 
+        max_version: int = 999, 
+        page: int = 0, 
+        offset: int = 0, 
+        trendsystem: Literal[0, 1] = 1, 
+        max_items: Optional[int] = None, 
+        cache_mode: CacheMode = "use"
+    ) -> AsyncIterator[Map]:
+        """Iterate over the :class:`.Map`s of a top category, see :meth:`find_top_maps`.
+
+        The next page is fetched in the background while the current one is consumed.
+        
+        :param game_mode: 1 => Simulation, 2 => Traffic Controller, 3 => Miscellaneous.
+        :param time: Which trending category to use.
+        :param result: Amount of :class:`.Map`s to request on each page.
+        :param max_version: The requester's game version.
+        :param page: Which page to start at.
+        :param offset: How many weeks / months / days from today to give results for.
+        :param trendsystem: Should always be set to 1 as that is the current version used ingame. 
+        :param max_items: Maximum amount of :class:`.Map`s to return, unlimited if omitted.
+        :param cache_mode: How to use the :class:`.ResponseCache`, see :data:`.CacheMode`.
+        """
+        return self._paginate(
+            lambda page: self.find_top_maps(game_mode=game_mode, time=time, result=result, max_version=max_version, page=page, offset=offset, trendsystem=trendsystem, cache_mode=cache_mode),
+            page, _next_page, result, max_items
+        )
+
+    def iter_comments(
+        self, 
+        map_id: int, 
+        limit: int = 50, 
+        before: Optional[int] = None, 
+        max_items: Optional[int] = None, 
+        cache_mode: CacheMode = "use"
+    ) -> AsyncIterator[Comment]:
+        """Iterate over every :class:`.Comment` under a :class:`.Map`, see :meth:`list_comments_on_map`.
+
+        The next page is fetched in the background while the current one is consumed.
+        
+        :param map_id: ID of the :class:`.Map`.
+        :param limit: Amount of :class:`.Comment`s to request on each page.
+        :param before: ID of the :class:`.Comment` to start after.
+        :param max_items: Maximum amount of :class:`.Comment`s to return, unlimited if omitted.
+        :param cache_mode: How to use the :class:`.ResponseCache`, see :data:`.CacheMode`.
+        """
+        return self._paginate(
+            lambda before: self.list_comments_on_map(map_id=map_id, limit=limit, before=before, cache_mode=cache_mode),
+            before, _next_comment, limit, max_items
+        )
+
+class RawClient(Client):
+    """A :class:`.Client` that skips model construction.
+
+    Every method returns the decoded JSON (dicts and lists) instead of :class:`.User`, :class:`.Map`, :class:`.Comment` and :class:`.HighScore` objects.
+    The :class:`.ResponseCache` keeps the undecoded body, so every call returns its own copy that is safe to modify.
+    With ``decode=False`` response bodies are returned as undecoded bytes, which is the cheapest way to forward them somewhere else.
+    In that mode ``as_table`` still works but the ``iter_*`` methods are not available.
+    """
+
+    def __init__(
+        self, 
+        session: Optional[aiohttp.ClientSession] = None, 
+        *args: Any, 
+        decode: bool = True, 
+        **kwargs: Any
+    ):
+        """Initialize a :class:`.RawClient` class instance.
+        
+        :param session: An aiohttp client session, created by the :class:`.Client` if omitted.
+        :param decode: Decode response bodies, return raw bytes if ``False``.
+
+        Other arguments are the same as for :class:`.Client`.
+        """
+        super().__init__(session, *args, **kwargs)
+        self._decode_bodies = decode
+        self._json_loads = self._loads
+        # Bodies are kept as bytes, so the cache and coalesced calls only share immutable values and every call decodes its own copy.
+        self._loads = bytes
+
+    def _decoded(
+        self, 
+        payload: Any
+    ) -> Any:
+        if isinstance(payload, (bytes, bytearray)):
+            return self._json_loads(payload)
+        return payload
+
+    def _build(
+        self, 
+        cls: Type[ICObjectBase], 
+        payload: Any
+    ) -> Any:
+        return self._decoded(payload) if self._decode_bodies else payload
+
+    def _build_many(
+        self, 
+        cls: Type[ICObjectBase], 
+        payload: Any
+    ) -> Any:
+        return self._decoded(payload) if self._decode_bodies else payload
+
+    def _table(
+        self, 
+        cls: Type[ColumnTable], 
+        payload: Any
+    ) -> ColumnTable:
+        return cls.from_payload(self, self._decoded(payload))
+
+    def _paginate(
+        self, 
+        fetch_page: Callable[[Any], Awaitable[List[Any]]], 
+        first_cursor: Any, 
+        next_cursor: Callable[[Any, List[Any]], Any], 
+        page_size: int, 
+        max_items: Optional[int]
+    ) -> AsyncIterator[Any]:
+        if not self._decode_bodies:
+            raise TypeError("pagination needs decoded responses, create the RawClient with decode=True")
+        return paginate(fetch_page, first_cursor, next_cursor, page_size, max_items)
 
-        async with self._session.get(f"https://tl3.shadowtree-software.se/TL3BackEnd/rest/highscore/public/{map_id}?count={count}", verify_ssl=False) as response:
-            high_scores = await response.json()
+def _next_page(page: int, items: List[Any]) -> int:
+    return page + 1
 
-        high_scores = [HighScore(self, high_score) for high_score in high_scores]
-        return high_scores
\ No newline at end of file
+def _next_comment(before: Optional[int], comments: List[Union[Comment, Dict[str, Any]]]) -> int:
+    last = comments[-1]
+    return last["objectId"] if isinstance(last, dict) else last.object_id
\ No newline at end of file